@@ -0,0 +1,11 @@
+"""
+Pytest configuration shared by the example tests.
+
+Keeps the repository root importable and provides a placeholder API key so the
+workflow modules can be imported without a real OpenAI account. Tests never
+reach the provider; LLM calls are replaced with fakes.
+"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
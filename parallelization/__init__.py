@@ -6,6 +6,24 @@ workflow architecture. It enables comprehensive legal document review by decompo
 analysis tasks into concurrent processing tracks that execute simultaneously.
 """
 
-from parallelization.graph import analyze_legal_document
+__all__ = [
+    "aanalyze_legal_document",
+    "analyze_legal_document",
+    "analyze_legal_document_stream",
+]
 
-__all__ = ["analyze_legal_document"]
+
+def __getattr__(name):
+    """
+    Import the workflow entry points on first access.
+
+    Building and compiling the graph pulls in every node and the LLM clients, so
+    importing a submodule such as parallelization.state or parallelization.prompts
+    does not pay for it until an entry point is actually used.
+    """
+    if name in __all__:
+        from parallelization import graph
+
+        return getattr(graph, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,145 @@
+"""
+Semantic Response Cache
+
+This module provides an embedding-keyed response cache for the Legal Document
+Analysis workflow. Templated documents (NDAs, MSAs) often differ in only a few
+clauses, so an exact-match cache misses them; comparing document embeddings lets
+near-duplicate documents reuse a previous analysis instead of calling the LLM.
+Entries are persisted in SQLite, so the cache warms up across runs.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Embedding similarity cache with one LRU index per analysis namespace.
+
+    Each namespace (e.g. a single analysis type for a single document type) keeps
+    its own index, so a hit can never return the output of a different task.
+    Document embeddings are memoized, so the parallel analyzers of one run embed
+    the document only once.
+    """
+
+    def __init__(self, embeddings, threshold, max_entries, path=None):
+        """
+        Args:
+            embeddings: Callable returning the LangChain embeddings client; looked
+                up on every use, as the client is bound to the running event loop
+            threshold: Default minimum cosine similarity for a cache hit
+            max_entries: Maximum cached responses per namespace (LRU eviction)
+            path: Optional SQLite file persisting the entries across runs
+        """
+        self.get_embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._indexes = {}
+        self._vectors = OrderedDict()
+        self._pending = {}
+        self._db = None
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_cache ("
+                "namespace TEXT, key TEXT, vector BLOB, response TEXT, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._load()
+
+    def _load(self):
+        """Restore the persisted entries, oldest first to preserve LRU order."""
+        rows = self._db.execute(
+            "SELECT namespace, key, vector, response FROM semantic_cache ORDER BY rowid"
+        )
+        for namespace, key, vector, response in rows:
+            index = self._indexes.setdefault(namespace, OrderedDict())
+            index[key] = (np.frombuffer(vector, dtype=np.float32), response)
+
+    async def _embed(self, text):
+        """Return the normalized embedding of text, embedding each text only once."""
+        key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+        if key in self._vectors:
+            self._vectors.move_to_end(key)
+            return self._vectors[key]
+
+        # Concurrent analyzers of the same document share one in-flight request
+        if key not in self._pending:
+            self._pending[key] = asyncio.ensure_future(
+                self.get_embeddings().aembed_query(text)
+            )
+        try:
+            vector = np.asarray(await self._pending[key], dtype=np.float32)
+        finally:
+            self._pending.pop(key, None)
+
+        vector /= np.linalg.norm(vector) or 1.0
+        self._vectors[key] = vector
+        if len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+
+        return vector
+
+    async def alookup(self, namespace, text, threshold=None):
+        """
+        Find a cached response for a document similar to text.
+
+        Args:
+            namespace: Index to search, e.g. the analysis result key
+            text: Document text used as the similarity key
+            threshold: Minimum cosine similarity, defaulting to the cache threshold
+
+        Returns:
+            The cached response, or None when no entry reaches the threshold
+        """
+        index = self._indexes.get(namespace)
+        if not index:
+            return None
+
+        vector = await self._embed(text)
+        keys = list(index)
+        similarities = np.stack([index[k][0] for k in keys]) @ vector
+        best = int(np.argmax(similarities))
+
+        if similarities[best] < (threshold or self.threshold):
+            return None
+
+        index.move_to_end(keys[best])
+        return index[keys[best]][1]
+
+    async def aupdate(self, namespace, text, response):
+        """
+        Store a response for text in the given namespace.
+
+        Args:
+            namespace: Index to insert into, e.g. the analysis result key
+            text: Document text used as the similarity key
+            response: Response to return for similar documents
+        """
+        vector = await self._embed(text)
+        index = self._indexes.setdefault(namespace, OrderedDict())
+        key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+        index[key] = (vector, response)
+        index.move_to_end(key)
+        evicted = (
+            index.popitem(last=False)[0] if len(index) > self.max_entries else None
+        )
+
+        if self._db:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO semantic_cache VALUES (?, ?, ?, ?)",
+                    (namespace, key, vector.tobytes(), response),
+                )
+                if evicted:
+                    self._db.execute(
+                        "DELETE FROM semantic_cache WHERE namespace = ? AND key = ?",
+                        (namespace, evicted),
+                    )
@@ -6,9 +6,12 @@ This module implements a sophisticated LangGraph workflow that decomposes comple
 analysis into concurrent processing paths to maximize throughput and analytical depth.
 
 Architecture Overview:
-1. Document Sectioning - Distributes analysis across 5 specialized parallel paths
-2. Sequential Processing - Maintains logical dependencies within each processing track
-3. Result Aggregation - Synthesizes distributed analyses into actionable insights
+1. Document Preparation - Chunks and embeds the document once for focused retrieval,
+   keeping the text in the document store so the graph state only carries its doc_id
+2. Document Sectioning - Routes the document to the relevant of 5 specialized parallel paths
+3. Concurrent Processing - Runs every independent analyzer in parallel, keeping only
+   the genuine data dependencies (scores, definition consistency) sequential
+4. Result Aggregation - Synthesizes distributed analyses into actionable insights
 
 This implementation demonstrates an efficient parallelization pattern for complex
 document processing tasks where multiple independent analyses can be conducted simultaneously.
@@ -17,24 +20,45 @@ document processing tasks where multiple independent analyses can be conducted s
 import sys
 import os
 import argparse
+import asyncio
 from typing import Annotated, TypedDict, Dict, List
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 from langgraph.graph import StateGraph, END, START
+from langgraph.types import RetryPolicy
 from parallelization.state import LegalDocumentAnalyzerState
+from parallelization.store import put_document, release_document
+from parallelization.utils import LLMConfig
+from shared.event_loop import event_loop_scope
 
 # Import specialized analysis node functions
+from parallelization.nodes.preparation import (
+    prepare_document,
+    release_prepared_document,
+)
 from parallelization.nodes.summary import generate_document_summary
+from parallelization.nodes.routing import (
+    ANALYSIS_NODES,
+    select_pipelines,
+    dispatch_analyses,
+)
 from parallelization.nodes.obligations import (
     analyze_payment_obligations,
     analyze_delivery_timelines,
     analyze_reporting_requirements,
     analyze_performance_criteria,
+    analyze_obligations_track,
 )
 from parallelization.nodes.risks import (
     analyze_liability_risks,
     analyze_termination_conditions,
     analyze_warranty_gaps,
     analyze_force_majeure_implications,
+    analyze_risk_track,
     calculate_risk_score,
 )
 from parallelization.nodes.opportunities import (
@@ -42,6 +66,7 @@ from parallelization.nodes.opportunities import (
     analyze_contract_extension_options,
     analyze_service_scope_expansion,
     analyze_early_termination_advantages,
+    analyze_opportunity_track,
     calculate_opportunity_score,
 )
 from parallelization.nodes.definitions import (
@@ -54,112 +79,355 @@ from parallelization.nodes.cross_reference import (
     identify_sequential_commitment_issues,
 )
 from parallelization.nodes.aggregation import (
-    aggregate_key_insights,
-    identify_critical_issues,
+    identify_key_findings,
     generate_markdown_report,
 )
 
+# Retry transient provider failures (429s, timeouts) on the failing node only,
+# instead of aborting the whole super-step
+LLM_RETRY_POLICY = RetryPolicy(max_attempts=LLMConfig.MAX_RETRY_ATTEMPTS)
+
+
 # Initialize state graph with the typed state container
 graph = StateGraph(LegalDocumentAnalyzerState)
 
 # Register all processing nodes to the workflow graph
-# Document summarization node (entry point)
-graph.add_node("generate_document_summary", generate_document_summary)
+# Document chunking and embedding node (entry point)
+graph.add_node(
+    "prepare_document",
+    prepare_document,
+    retry_policy=LLM_RETRY_POLICY,
+)
+
+# Document summarization node
+graph.add_node(
+    "generate_document_summary",
+    generate_document_summary,
+    retry_policy=LLM_RETRY_POLICY,
+)
+
+# Pipeline routing node
+graph.add_node(
+    "select_pipelines",
+    select_pipelines,
+    retry_policy=LLM_RETRY_POLICY,
+)
 
 # Obligation analysis pipeline nodes
-graph.add_node("analyze_payment_obligations", analyze_payment_obligations)
-graph.add_node("analyze_delivery_timelines", analyze_delivery_timelines)
-graph.add_node("analyze_reporting_requirements", analyze_reporting_requirements)
-graph.add_node("analyze_performance_criteria", analyze_performance_criteria)
+graph.add_node(
+    "analyze_payment_obligations",
+    analyze_payment_obligations,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_delivery_timelines",
+    analyze_delivery_timelines,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_reporting_requirements",
+    analyze_reporting_requirements,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_performance_criteria",
+    analyze_performance_criteria,
+    retry_policy=LLM_RETRY_POLICY,
+)
 
 # Risk assessment pipeline nodes
-graph.add_node("analyze_liability_risks", analyze_liability_risks)
-graph.add_node("analyze_termination_conditions", analyze_termination_conditions)
-graph.add_node("analyze_warranty_gaps", analyze_warranty_gaps)
-graph.add_node("analyze_force_majeure_implications", analyze_force_majeure_implications)
-graph.add_node("calculate_risk_score", calculate_risk_score)
+graph.add_node(
+    "analyze_liability_risks",
+    analyze_liability_risks,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_termination_conditions",
+    analyze_termination_conditions,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_warranty_gaps",
+    analyze_warranty_gaps,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_force_majeure_implications",
+    analyze_force_majeure_implications,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "calculate_risk_score",
+    calculate_risk_score,
+    retry_policy=LLM_RETRY_POLICY,
+)
 
 # Opportunity identification pipeline nodes
-graph.add_node("analyze_pricing_leverage_points", analyze_pricing_leverage_points)
-graph.add_node("analyze_contract_extension_options", analyze_contract_extension_options)
-graph.add_node("analyze_service_scope_expansion", analyze_service_scope_expansion)
 graph.add_node(
-    "analyze_early_termination_advantages", analyze_early_termination_advantages
+    "analyze_pricing_leverage_points",
+    analyze_pricing_leverage_points,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_contract_extension_options",
+    analyze_contract_extension_options,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_service_scope_expansion",
+    analyze_service_scope_expansion,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_early_termination_advantages",
+    analyze_early_termination_advantages,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "calculate_opportunity_score",
+    calculate_opportunity_score,
+    retry_policy=LLM_RETRY_POLICY,
 )
-graph.add_node("calculate_opportunity_score", calculate_opportunity_score)
 
 # Definition analysis pipeline nodes
-graph.add_node("extract_defined_terms", extract_defined_terms)
-graph.add_node("analyze_definition_consistency", analyze_definition_consistency)
+graph.add_node(
+    "extract_defined_terms",
+    extract_defined_terms,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_definition_consistency",
+    analyze_definition_consistency,
+    retry_policy=LLM_RETRY_POLICY,
+)
 
 # Cross-reference validation pipeline nodes
-graph.add_node("identify_direct_contradictions", identify_direct_contradictions)
-graph.add_node("identify_implied_inconsistencies", identify_implied_inconsistencies)
 graph.add_node(
-    "identify_sequential_commitment_issues", identify_sequential_commitment_issues
+    "identify_direct_contradictions",
+    identify_direct_contradictions,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "identify_implied_inconsistencies",
+    identify_implied_inconsistencies,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "identify_sequential_commitment_issues",
+    identify_sequential_commitment_issues,
+    retry_policy=LLM_RETRY_POLICY,
 )
 
-# Final analysis aggregation and reporting nodes
-graph.add_node("aggregate_results", aggregate_key_insights)
-graph.add_node("identify_critical_issues", identify_critical_issues)
-graph.add_node("generate_markdown_report", generate_markdown_report)
-
-# Define the workflow execution paths
-
-# Initial document processing - Generate comprehensive summary
-graph.add_edge(START, "generate_document_summary")
+# Fused track nodes, dispatched instead of the four-analyzer pipelines when
+# LLMConfig.FUSED_TRACKS is set
+graph.add_node(
+    "analyze_obligations_track",
+    analyze_obligations_track,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_risk_track",
+    analyze_risk_track,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "analyze_opportunity_track",
+    analyze_opportunity_track,
+    retry_policy=LLM_RETRY_POLICY,
+)
 
-# Branch into 5 parallel analysis pipelines from the document summary
+# Final analysis aggregation and reporting nodes. Aggregation is deferred until
+# every dispatched pipeline has finished (routing may skip some of them).
+graph.add_node(
+    "identify_key_findings",
+    identify_key_findings,
+    defer=True,
+    retry_policy=LLM_RETRY_POLICY,
+)
+graph.add_node(
+    "generate_markdown_report",
+    generate_markdown_report,
+    retry_policy=LLM_RETRY_POLICY,
+)
 
-# 1. Obligation Analysis Pipeline - Sequential dependency chain
-graph.add_edge("generate_document_summary", "analyze_payment_obligations")
-graph.add_edge("analyze_payment_obligations", "analyze_delivery_timelines")
-graph.add_edge("analyze_delivery_timelines", "analyze_reporting_requirements")
-graph.add_edge("analyze_reporting_requirements", "analyze_performance_criteria")
+# Document store cleanup node (exit point)
+graph.add_node("release_prepared_document", release_prepared_document)
 
-# 2. Risk Analysis Pipeline - Sequential dependency chain
-graph.add_edge("generate_document_summary", "analyze_liability_risks")
-graph.add_edge("analyze_liability_risks", "analyze_termination_conditions")
-graph.add_edge("analyze_termination_conditions", "analyze_warranty_gaps")
-graph.add_edge("analyze_warranty_gaps", "analyze_force_majeure_implications")
-graph.add_edge("analyze_force_majeure_implications", "calculate_risk_score")
+# Define the workflow execution paths
 
-# 3. Opportunity Analysis Pipeline - Sequential dependency chain
-graph.add_edge("generate_document_summary", "analyze_pricing_leverage_points")
-graph.add_edge("analyze_pricing_leverage_points", "analyze_contract_extension_options")
-graph.add_edge("analyze_contract_extension_options", "analyze_service_scope_expansion")
-graph.add_edge(
-    "analyze_service_scope_expansion", "analyze_early_termination_advantages"
-)
-graph.add_edge("analyze_early_termination_advantages", "calculate_opportunity_score")
+# Initial document processing - Chunk the document, then generate a comprehensive summary
+graph.add_edge(START, "prepare_document")
+graph.add_edge("prepare_document", "generate_document_summary")
 
-# 4. Definition Analysis Pipeline - Sequential dependency chain
-graph.add_edge("generate_document_summary", "extract_defined_terms")
-graph.add_edge("extract_defined_terms", "analyze_definition_consistency")
+# Select the relevant pipelines, then dispatch their analyzers in parallel.
+# Within each pipeline only the genuine data dependencies remain as edges.
+graph.add_edge("generate_document_summary", "select_pipelines")
+graph.add_conditional_edges("select_pipelines", dispatch_analyses, list(ANALYSIS_NODES))
 
-# 5. Cross-Reference Validation Pipeline - Sequential dependency chain
-graph.add_edge("generate_document_summary", "identify_direct_contradictions")
-graph.add_edge("identify_direct_contradictions", "identify_implied_inconsistencies")
+# Risk Analysis Pipeline - Parallel analyzers converging on the risk score
 graph.add_edge(
-    "identify_implied_inconsistencies", "identify_sequential_commitment_issues"
+    [
+        "analyze_liability_risks",
+        "analyze_termination_conditions",
+        "analyze_warranty_gaps",
+        "analyze_force_majeure_implications",
+    ],
+    "calculate_risk_score",
 )
 
-# Convergence point - Merge all parallel analysis results
+# Opportunity Analysis Pipeline - Parallel analyzers converging on the opportunity score
 graph.add_edge(
     [
-        "analyze_performance_criteria",  # Obligations pipeline terminal node
-        "calculate_risk_score",  # Risk pipeline terminal node
-        "calculate_opportunity_score",  # Opportunities pipeline terminal node
-        "analyze_definition_consistency",  # Definitions pipeline terminal node
-        "identify_sequential_commitment_issues",  # Cross-reference pipeline terminal node
+        "analyze_pricing_leverage_points",
+        "analyze_contract_extension_options",
+        "analyze_service_scope_expansion",
+        "analyze_early_termination_advantages",
     ],
-    "aggregate_results",
+    "calculate_opportunity_score",
 )
 
-# Final report generation sequence
-graph.add_edge("aggregate_results", "identify_critical_issues")
-graph.add_edge("identify_critical_issues", "generate_markdown_report")
-graph.add_edge("generate_markdown_report", END)
+# Fused tracks feed the same score nodes as their four-analyzer pipelines
+graph.add_edge("analyze_risk_track", "calculate_risk_score")
+graph.add_edge("analyze_opportunity_track", "calculate_opportunity_score")
+
+# Definition Analysis Pipeline - Consistency analysis consumes the extracted terms
+graph.add_edge("extract_defined_terms", "analyze_definition_consistency")
+
+# Convergence point - Merge the results of every pipeline that ran
+for terminal_node in (
+    # Obligations pipeline terminal nodes
+    "analyze_payment_obligations",
+    "analyze_delivery_timelines",
+    "analyze_reporting_requirements",
+    "analyze_performance_criteria",
+    "analyze_obligations_track",  # Fused obligations pipeline terminal node
+    "calculate_risk_score",  # Risk pipeline terminal node
+    "calculate_opportunity_score",  # Opportunities pipeline terminal node
+    "analyze_definition_consistency",  # Definitions pipeline terminal node
+    # Cross-reference pipeline terminal nodes
+    "identify_direct_contradictions",
+    "identify_implied_inconsistencies",
+    "identify_sequential_commitment_issues",
+):
+    graph.add_edge(terminal_node, "identify_key_findings")
 
-# Compile the graph into an executable workflow
+# Final report generation - Key findings first, then the streamed markdown report,
+# then release the document
+graph.add_edge("identify_key_findings", "generate_markdown_report")
+graph.add_edge("generate_markdown_report", "release_prepared_document")
+graph.add_edge("release_prepared_document", END)
+
+# Compile the graph into an executable workflow. Programmatic callers should go
+# through the analyze_legal_document entry points below, which release the stored
+# document in a finally block. Invoking the workflow directly with document_text,
+# as LangGraph Studio does, relies on release_prepared_document, so a run that
+# fails before reaching it leaves its document in the store.
 workflow = graph.compile()
+
+# Limit concurrent branches so a single document does not burst past the provider's
+# rate limits
+WORKFLOW_CONFIG = {
+    "max_concurrency": LLMConfig.MAX_CONCURRENCY,
+    "recursion_limit": 50,
+}
+
+
+async def aanalyze_legal_document(document_text, document_type="Contract"):
+    """
+    Run the complete legal document analysis workflow asynchronously.
+
+    All analysis nodes are coroutines, so parallel branches overlap their LLM
+    requests on a single event loop. Branches are throttled with max_concurrency
+    so a single document does not burst past the provider's rate limits. The
+    pooled clients of the event loop are closed once the last analysis running
+    on it has finished.
+
+    Args:
+        document_text: Complete text content of the legal document
+        document_type: Document classification (contract, agreement, NDA, etc.)
+
+    Returns:
+        dict: Final workflow state including scores, insights and the markdown report
+    """
+    # Only the doc_id travels through the graph state; the text stays in the store
+    doc_id = put_document(document_text)
+    initial_state = {"doc_id": doc_id, "document_type": document_type}
+
+    try:
+        async with event_loop_scope():
+            return await workflow.ainvoke(initial_state, config=WORKFLOW_CONFIG)
+    finally:
+        release_document(doc_id)
+
+
+async def analyze_legal_document_stream(document_text, document_type="Contract"):
+    """
+    Run the workflow asynchronously, yielding the state as it progresses.
+
+    A new state is yielded after every completed step and for each piece of the
+    markdown report as it is generated, so the report can be displayed while it
+    is still being written.
+
+    Args:
+        document_text: Complete text content of the legal document
+        document_type: Document classification (contract, agreement, NDA, etc.)
+
+    Yields:
+        dict: The latest workflow state; the last one is the final state
+    """
+    doc_id = put_document(document_text)
+    initial_state = {"doc_id": doc_id, "document_type": document_type}
+    state = dict(initial_state)
+    report_id, report = None, ""
+
+    try:
+        async with event_loop_scope():
+            async for mode, payload in workflow.astream(
+                initial_state,
+                config=WORKFLOW_CONFIG,
+                stream_mode=["values", "messages"],
+            ):
+                if mode == "values":
+                    state = payload
+                    yield state
+                    continue
+
+                chunk, metadata = payload
+                if metadata.get("langgraph_node") != "generate_markdown_report":
+                    continue
+
+                # A retried report node starts a new message, so restart the report
+                if chunk.id != report_id:
+                    report_id, report = chunk.id, ""
+                report += chunk.content
+                yield {**state, "markdown_report": report}
+    finally:
+        release_document(doc_id)
+
+
+def analyze_legal_document(document_text, document_type="Contract"):
+    """
+    Run the complete legal document analysis workflow.
+
+    Synchronous entry point for callers without a running event loop; it drives
+    aanalyze_legal_document to completion. When uvloop is installed the workflow
+    runs on its libuv-based event loop, which schedules the many concurrent LLM
+    requests with less per-task overhead than the default asyncio loop.
+
+    It cannot be called while an event loop is already running in the thread,
+    as in a Jupyter notebook; use ``await aanalyze_legal_document(...)`` there.
+
+    Args:
+        document_text: Complete text content of the legal document
+        document_type: Document classification (contract, agreement, NDA, etc.)
+
+    Returns:
+        dict: Final workflow state including scores, insights and the markdown report
+
+    Raises:
+        RuntimeError: If called from inside a running event loop
+    """
+    loop_factory = uvloop.new_event_loop if uvloop else None
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(aanalyze_legal_document(document_text, document_type))
@@ -12,10 +12,14 @@ from parallelization.prompts import (
     IMPLIED_INCONSISTENCIES_TEMPLATE,
     SEQUENTIAL_COMMITMENT_ISSUES_TEMPLATE,
 )
-from parallelization.utils import call_llm_with_template
+from parallelization.utils import (
+    call_llm_with_template,
+    document_cache_key,
+    with_document,
+)
 
 
-def identify_direct_contradictions(state: LegalDocumentAnalyzerState):
+async def identify_direct_contradictions(state: LegalDocumentAnalyzerState):
     """
     Detect explicit contradictions between different clauses in the document.
 
@@ -28,12 +32,16 @@ def identify_direct_contradictions(state: LegalDocumentAnalyzerState):
     Returns:
         dict: Updated state with identified contradictions
     """
-    result = call_llm_with_template(state, DIRECT_CONTRADICTIONS_TEMPLATE)
+    result = await call_llm_with_template(
+        with_document(state),
+        DIRECT_CONTRADICTIONS_TEMPLATE,
+        cache_key=document_cache_key(state["doc_id"]),
+    )
 
     return {"direct_contradictions": result}
 
 
-def identify_implied_inconsistencies(state: LegalDocumentAnalyzerState):
+async def identify_implied_inconsistencies(state: LegalDocumentAnalyzerState):
     """
     Detect logical inconsistencies that create indirect conflicts.
 
@@ -46,12 +54,16 @@ def identify_implied_inconsistencies(state: LegalDocumentAnalyzerState):
     Returns:
         dict: Updated state with identified logical inconsistencies
     """
-    result = call_llm_with_template(state, IMPLIED_INCONSISTENCIES_TEMPLATE)
+    result = await call_llm_with_template(
+        with_document(state),
+        IMPLIED_INCONSISTENCIES_TEMPLATE,
+        cache_key=document_cache_key(state["doc_id"]),
+    )
 
     return {"implied_inconsistencies": result}
 
 
-def identify_sequential_commitment_issues(state: LegalDocumentAnalyzerState):
+async def identify_sequential_commitment_issues(state: LegalDocumentAnalyzerState):
     """
     Identify timeline conflicts and sequential dependency problems.
 
@@ -64,6 +76,10 @@ def identify_sequential_commitment_issues(state: LegalDocumentAnalyzerState):
     Returns:
         dict: Updated state with identified sequential commitment issues
     """
-    result = call_llm_with_template(state, SEQUENTIAL_COMMITMENT_ISSUES_TEMPLATE)
+    result = await call_llm_with_template(
+        with_document(state),
+        SEQUENTIAL_COMMITMENT_ISSUES_TEMPLATE,
+        cache_key=document_cache_key(state["doc_id"]),
+    )
 
     return {"sequential_commitment_issues": result}
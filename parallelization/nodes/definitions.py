@@ -7,8 +7,8 @@ the consistency of term usage throughout the document.
 """
 
 from parallelization.state import LegalDocumentAnalyzerState
-from pydantic import BaseModel, Field
-from typing import Dict, List
+from parallelization.store import get_document
+from typing import Annotated, Dict, List, TypedDict
 from parallelization.prompts import (
     DEFINED_TERMS_TEMPLATE,
     DEFINITION_CONSISTENCY_TEMPLATE,
@@ -16,10 +16,12 @@ from parallelization.prompts import (
 from parallelization.utils import (
     call_llm_with_template,
     call_structured_llm,
+    document_cache_key,
+    with_document,
 )
 
 
-class DefinedTerms(BaseModel):
+class DefinedTerms(TypedDict):
     """
     Structured output model for defined terminology extraction.
 
@@ -27,15 +29,15 @@ class DefinedTerms(BaseModel):
     to enable comprehensive analysis of definition usage and consistency.
     """
 
-    industry_specific_terms: str = Field(
-        description="Industry-specific terms and their definitions"
-    )
-    contract_specific_definitions: str = Field(
-        description="Contract-specific terms and their definitions"
-    )
+    industry_specific_terms: Annotated[
+        str, ..., "Industry-specific terms and their definitions"
+    ]
+    contract_specific_definitions: Annotated[
+        str, ..., "Contract-specific terms and their definitions"
+    ]
 
 
-def extract_defined_terms(state: LegalDocumentAnalyzerState):
+async def extract_defined_terms(state: LegalDocumentAnalyzerState):
     """
     Extract and categorize defined terminology from the legal document.
 
@@ -48,19 +50,20 @@ def extract_defined_terms(state: LegalDocumentAnalyzerState):
     Returns:
         dict: Updated state with extracted terminology categorized by type
     """
-    prompt_template = DEFINED_TERMS_TEMPLATE.format(
-        document_type=state["document_type"], document_text=state["document_text"]
+    res = await call_structured_llm(
+        with_document(state),
+        DEFINED_TERMS_TEMPLATE,
+        DefinedTerms,
+        cache_key=document_cache_key(state["doc_id"]),
     )
 
-    res = call_structured_llm(state, prompt_template, DefinedTerms)
-
     return {
-        "industry_specific_terms": res.industry_specific_terms,
-        "contract_specific_definitions": res.contract_specific_definitions,
+        "industry_specific_terms": res["industry_specific_terms"],
+        "contract_specific_definitions": res["contract_specific_definitions"],
     }
 
 
-def analyze_definition_consistency(state: LegalDocumentAnalyzerState):
+async def analyze_definition_consistency(state: LegalDocumentAnalyzerState):
     """
     Evaluate the consistency of terminology usage throughout the document.
 
@@ -87,11 +90,16 @@ def analyze_definition_consistency(state: LegalDocumentAnalyzerState):
 
     # Create a new state dictionary with terms_text for template formatting
     analysis_state = {
+        "doc_id": state["doc_id"],
         "document_type": state["document_type"],
-        "document_text": state["document_text"],
+        "document_text": get_document(state["doc_id"]),
         "terms_text": terms_text,
     }
 
-    result = call_llm_with_template(analysis_state, DEFINITION_CONSISTENCY_TEMPLATE)
+    result = await call_llm_with_template(
+        analysis_state,
+        DEFINITION_CONSISTENCY_TEMPLATE,
+        cache_key=document_cache_key(state["doc_id"]),
+    )
 
     return {"definition_consistency_issues": result}
@@ -6,32 +6,68 @@ It extracts and analyzes financial and operational commitments including payment
 delivery requirements, reporting obligations, and performance standards.
 """
 
+from typing import Annotated, TypedDict
+
 from parallelization.state import LegalDocumentAnalyzerState
 from parallelization.prompts import (
     PAYMENT_OBLIGATIONS_TEMPLATE,
+    PAYMENT_OBLIGATIONS_QUERY,
     DELIVERY_TIMELINES_TEMPLATE,
+    DELIVERY_TIMELINES_QUERY,
     REPORTING_REQUIREMENTS_TEMPLATE,
+    REPORTING_REQUIREMENTS_QUERY,
     PERFORMANCE_CRITERIA_TEMPLATE,
+    PERFORMANCE_CRITERIA_QUERY,
+    OBLIGATIONS_TRACK_TEMPLATE,
 )
 from parallelization.utils import create_analysis_function
 
 
+class ObligationsTrack(TypedDict):
+    """
+    Structured output model for the fused obligation analysis.
+
+    Holds one analysis per obligation dimension, matching the state keys written
+    by the individual obligation analyzers.
+    """
+
+    payment_obligations: Annotated[str, ..., "Payment obligations analysis"]
+    delivery_timelines: Annotated[str, ..., "Delivery timelines analysis"]
+    reporting_requirements: Annotated[str, ..., "Reporting requirements analysis"]
+    performance_criteria: Annotated[str, ..., "Performance criteria analysis"]
+
+
 # Payment analysis processor
 analyze_payment_obligations = create_analysis_function(
-    PAYMENT_OBLIGATIONS_TEMPLATE, "payment_obligations"
+    PAYMENT_OBLIGATIONS_TEMPLATE, "payment_obligations", PAYMENT_OBLIGATIONS_QUERY
 )
 
 # Delivery timeline analysis processor
 analyze_delivery_timelines = create_analysis_function(
-    DELIVERY_TIMELINES_TEMPLATE, "delivery_timelines"
+    DELIVERY_TIMELINES_TEMPLATE, "delivery_timelines", DELIVERY_TIMELINES_QUERY
 )
 
 # Reporting requirements analysis processor
 analyze_reporting_requirements = create_analysis_function(
-    REPORTING_REQUIREMENTS_TEMPLATE, "reporting_requirements"
+    REPORTING_REQUIREMENTS_TEMPLATE,
+    "reporting_requirements",
+    REPORTING_REQUIREMENTS_QUERY,
 )
 
 # Performance criteria analysis processor
 analyze_performance_criteria = create_analysis_function(
-    PERFORMANCE_CRITERIA_TEMPLATE, "performance_criteria"
+    PERFORMANCE_CRITERIA_TEMPLATE, "performance_criteria", PERFORMANCE_CRITERIA_QUERY
+)
+
+# Fused processor covering all four obligation dimensions in one call
+analyze_obligations_track = create_analysis_function(
+    OBLIGATIONS_TRACK_TEMPLATE,
+    "obligations_track",
+    (
+        PAYMENT_OBLIGATIONS_QUERY,
+        DELIVERY_TIMELINES_QUERY,
+        REPORTING_REQUIREMENTS_QUERY,
+        PERFORMANCE_CRITERIA_QUERY,
+    ),
+    ObligationsTrack,
 )
@@ -6,19 +6,34 @@ It identifies advantageous provisions related to pricing terms, contract extensi
 service expansion options, and favorable termination conditions.
 """
 
+import re
+from collections import ChainMap
+from typing import Annotated, TypedDict
+
+import numpy as np
+
 from parallelization.state import LegalDocumentAnalyzerState
-from pydantic import BaseModel, Field
 from parallelization.prompts import (
     PRICING_LEVERAGE_POINTS_TEMPLATE,
+    PRICING_LEVERAGE_POINTS_QUERY,
     CONTRACT_EXTENSION_OPTIONS_TEMPLATE,
+    CONTRACT_EXTENSION_OPTIONS_QUERY,
     SERVICE_SCOPE_EXPANSION_TEMPLATE,
+    SERVICE_SCOPE_EXPANSION_QUERY,
     EARLY_TERMINATION_ADVANTAGES_TEMPLATE,
+    EARLY_TERMINATION_ADVANTAGES_QUERY,
     OPPORTUNITY_SCORE_TEMPLATE,
+    OPPORTUNITY_TRACK_TEMPLATE,
+)
+from parallelization.utils import (
+    create_analysis_function,
+    call_structured_llm,
+    weighted_score,
+    LLMConfig,
 )
-from parallelization.utils import create_analysis_function, call_structured_llm
 
 
-class OpportunityScore(BaseModel):
+class OpportunityScore(TypedDict):
     """
     Structured output model for opportunity assessment scoring.
 
@@ -26,39 +41,120 @@ class OpportunityScore(BaseModel):
     to ensure transparent and justifiable scoring.
     """
 
-    score: float = Field(
-        description="Opportunity score from 0-100, where 100 is highest opportunity",
+    score: Annotated[
+        float, ..., "Opportunity score from 0-100, where 100 is highest opportunity"
+    ]
+    explanation: Annotated[str, ..., "Brief explanation of the opportunity score"]
+
+
+class OpportunityTrack(TypedDict):
+    """
+    Structured output model for the fused opportunity analysis.
+
+    Holds one analysis per opportunity dimension, matching the state keys written
+    by the individual opportunity analyzers.
+    """
+
+    pricing_leverage_points: Annotated[str, ..., "Pricing leverage points analysis"]
+    contract_extension_options: Annotated[
+        str, ..., "Contract extension options analysis"
+    ]
+    service_scope_expansion: Annotated[str, ..., "Service scope expansion analysis"]
+    early_termination_advantages: Annotated[
+        str, ..., "Early termination advantages analysis"
+    ]
+
+
+# Opportunity dimensions consumed by the opportunity score, and their relative
+# weight in the deterministic score
+OPPORTUNITY_FIELDS = (
+    "pricing_leverage_points",
+    "contract_extension_options",
+    "service_scope_expansion",
+    "early_termination_advantages",
+)
+OPPORTUNITY_WEIGHTS = np.array([0.3, 0.2, 0.3, 0.2])
+
+# Placeholders for opportunity analyses that did not run, looked up behind the state
+_OPPORTUNITY_DEFAULTS = dict.fromkeys(OPPORTUNITY_FIELDS, "Not analyzed")
+
+# Number of identified items at which a dimension counts as fully favorable
+SIGNAL_SATURATION = 5
+
+# Matches the list items the analysis prompts ask each finding to be written as
+_LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*\u2022]|\d+[.)])\s+", re.MULTILINE)
+
+
+def _opportunity_signals(state: LegalDocumentAnalyzerState):
+    """
+    Measure each opportunity dimension by the number of items its analysis found.
+
+    Args:
+        state: The current workflow state containing opportunity analysis results
+
+    Returns:
+        np.ndarray: One saturated signal per entry of OPPORTUNITY_FIELDS
+    """
+    return np.array(
+        [
+            len(_LIST_ITEM_PATTERN.findall(state.get(field) or "")) / SIGNAL_SATURATION
+            for field in OPPORTUNITY_FIELDS
+        ]
     )
-    explanation: str = Field(description="Brief explanation of the opportunity score")
 
 
 # Pricing leverage analysis processor
 analyze_pricing_leverage_points = create_analysis_function(
-    PRICING_LEVERAGE_POINTS_TEMPLATE, "pricing_leverage_points"
+    PRICING_LEVERAGE_POINTS_TEMPLATE,
+    "pricing_leverage_points",
+    PRICING_LEVERAGE_POINTS_QUERY,
 )
 
 # Contract extension analysis processor
 analyze_contract_extension_options = create_analysis_function(
-    CONTRACT_EXTENSION_OPTIONS_TEMPLATE, "contract_extension_options"
+    CONTRACT_EXTENSION_OPTIONS_TEMPLATE,
+    "contract_extension_options",
+    CONTRACT_EXTENSION_OPTIONS_QUERY,
 )
 
 # Service scope analysis processor
 analyze_service_scope_expansion = create_analysis_function(
-    SERVICE_SCOPE_EXPANSION_TEMPLATE, "service_scope_expansion"
+    SERVICE_SCOPE_EXPANSION_TEMPLATE,
+    "service_scope_expansion",
+    SERVICE_SCOPE_EXPANSION_QUERY,
 )
 
 # Termination advantages analysis processor
 analyze_early_termination_advantages = create_analysis_function(
-    EARLY_TERMINATION_ADVANTAGES_TEMPLATE, "early_termination_advantages"
+    EARLY_TERMINATION_ADVANTAGES_TEMPLATE,
+    "early_termination_advantages",
+    EARLY_TERMINATION_ADVANTAGES_QUERY,
 )
 
+# Fused processor covering all four opportunity dimensions in one call
+analyze_opportunity_track = create_analysis_function(
+    OPPORTUNITY_TRACK_TEMPLATE,
+    "opportunity_track",
+    (
+        PRICING_LEVERAGE_POINTS_QUERY,
+        CONTRACT_EXTENSION_OPTIONS_QUERY,
+        SERVICE_SCOPE_EXPANSION_QUERY,
+        EARLY_TERMINATION_ADVANTAGES_QUERY,
+    ),
+    OpportunityTrack,
+)
 
-def calculate_opportunity_score(state: LegalDocumentAnalyzerState):
+
+async def calculate_opportunity_score(state: LegalDocumentAnalyzerState):
     """
     Calculate a comprehensive opportunity score based on multiple opportunity dimensions.
 
     This function aggregates findings from the various opportunity analysis processors
     and synthesizes them into a single, quantified opportunity assessment score.
+    The score is assessed by an LLM unless LLMConfig.USE_DETERMINISTIC_SCORING
+    is set, in which case it is computed from the weighted number of
+    opportunities identified per dimension and the LLM is consulted only when
+    the analyses list no items.
 
     Args:
         state: The current workflow state containing opportunity analysis results
@@ -66,21 +162,18 @@ def calculate_opportunity_score(state: LegalDocumentAnalyzerState):
     Returns:
         dict: Updated state with the calculated opportunity score
     """
-    # Prepare state with default values for missing keys
-    analysis_state = {
-        "document_type": state["document_type"],
-        "pricing_leverage_points": state.get("pricing_leverage_points", "Not analyzed"),
-        "contract_extension_options": state.get(
-            "contract_extension_options", "Not analyzed"
-        ),
-        "service_scope_expansion": state.get("service_scope_expansion", "Not analyzed"),
-        "early_termination_advantages": state.get(
-            "early_termination_advantages", "Not analyzed"
-        ),
-    }
-
-    res = call_structured_llm(
+    if LLMConfig.USE_DETERMINISTIC_SCORING:
+        signals = _opportunity_signals(state)
+        # Analyses written without list items give the count nothing to measure
+        if signals.any():
+            score = weighted_score(OPPORTUNITY_WEIGHTS, signals)
+            return {"opportunity_score": round(float(score), 1)}
+
+    # Missing fields fall back to their placeholders without copying the state
+    analysis_state = ChainMap(state, _OPPORTUNITY_DEFAULTS)
+
+    res = await call_structured_llm(
         analysis_state, OPPORTUNITY_SCORE_TEMPLATE, OpportunityScore
     )
 
-    return {"opportunity_score": res.score}
+    return {"opportunity_score": float(res["score"])}
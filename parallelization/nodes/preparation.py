@@ -0,0 +1,69 @@
+"""
+Document Preparation
+
+This module implements the entry point of the legal document analyzer. It splits
+the document into chunks and embeds them once, so each focused analyzer can
+retrieve only the sections relevant to its concern instead of re-sending the
+full document text in every prompt.
+"""
+
+from parallelization.state import LegalDocumentAnalyzerState
+from parallelization.store import (
+    get_document,
+    put_chunks,
+    put_document,
+    release_document,
+)
+from parallelization.utils import aprepare_chunks
+
+
+async def prepare_document(state: LegalDocumentAnalyzerState):
+    """
+    Chunk and embed the legal document for retrieval by downstream analyzers.
+
+    The text, chunks and embeddings are kept in the document store. A document
+    passed to the workflow directly as document_text is moved there as well, so
+    later steps only carry its doc_id, and released by release_prepared_document
+    once the report is written. A direct run that fails before then leaves the
+    document in the store, so programmatic callers should use the
+    analyze_legal_document entry points, which always release it.
+
+    Args:
+        state: The current workflow state containing the doc_id or document text
+
+    Returns:
+        dict: Updated state with the doc_id and the document text cleared
+    """
+    document_owned = not state.get("doc_id")
+    document_text = (
+        state["document_text"] if document_owned else get_document(state["doc_id"])
+    )
+
+    chunks, embeddings = await aprepare_chunks(document_text)
+
+    # Stored only after chunking succeeds, so a retried attempt leaves nothing behind
+    doc_id = put_document(document_text) if document_owned else state["doc_id"]
+    put_chunks(doc_id, chunks, embeddings)
+
+    return {"doc_id": doc_id, "document_text": None, "document_owned": document_owned}
+
+
+def release_prepared_document(state: LegalDocumentAnalyzerState):
+    """
+    Drop the document from the store if prepare_document stored it.
+
+    Documents stored by the analyze_legal_document entry points are released by
+    the entry points themselves, even when the run fails, and are left untouched
+    here. This node only runs when the workflow completes, so it is best-effort
+    cleanup for direct invocations such as LangGraph Studio runs.
+
+    Args:
+        state: The final workflow state containing the doc_id
+
+    Returns:
+        dict: Empty update, as the state itself is unchanged
+    """
+    if state.get("document_owned"):
+        release_document(state["doc_id"])
+
+    return {}
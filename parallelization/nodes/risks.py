@@ -6,19 +6,34 @@ It evaluates liability exposures, termination conditions, warranty limitations,
 and force majeure provisions, culminating in a quantified risk assessment score.
 """
 
+import re
+from collections import ChainMap
+from typing import Annotated, TypedDict
+
+import numpy as np
+
 from parallelization.state import LegalDocumentAnalyzerState
-from pydantic import BaseModel, Field
 from parallelization.prompts import (
     LIABILITY_RISKS_TEMPLATE,
+    LIABILITY_RISKS_QUERY,
     TERMINATION_CONDITIONS_TEMPLATE,
+    TERMINATION_CONDITIONS_QUERY,
     WARRANTY_GAPS_TEMPLATE,
+    WARRANTY_GAPS_QUERY,
     FORCE_MAJEURE_TEMPLATE,
+    FORCE_MAJEURE_QUERY,
     RISK_SCORE_TEMPLATE,
+    RISK_TRACK_TEMPLATE,
+)
+from parallelization.utils import (
+    create_analysis_function,
+    call_structured_llm,
+    weighted_score,
+    LLMConfig,
 )
-from parallelization.utils import create_analysis_function, call_structured_llm
 
 
-class RiskScore(BaseModel):
+class RiskScore(TypedDict):
     """
     Structured output model for risk score calculation.
 
@@ -26,37 +41,156 @@ class RiskScore(BaseModel):
     to ensure transparent and justifiable scoring.
     """
 
-    score: float = Field(description="Risk score from 0-100, where 100 is highest risk")
-    explanation: str = Field(description="Brief explanation of the risk score")
+    score: Annotated[float, ..., "Risk score from 0-100, where 100 is highest risk"]
+    explanation: Annotated[str, ..., "Brief explanation of the risk score"]
+
+
+class RiskTrack(TypedDict):
+    """
+    Structured output model for the fused risk analysis.
+
+    Holds one analysis per risk dimension, matching the state keys written by
+    the individual risk analyzers.
+    """
+
+    liability_risks: Annotated[str, ..., "Liability risks analysis"]
+    termination_conditions: Annotated[str, ..., "Termination conditions analysis"]
+    warranty_gaps: Annotated[str, ..., "Warranty gaps analysis"]
+    force_majeure_implications: Annotated[
+        str, ..., "Force majeure implications analysis"
+    ]
+
+
+# Risk dimensions consumed by the risk score, and their relative weight in the
+# deterministic score
+RISK_FIELDS = (
+    "liability_risks",
+    "termination_conditions",
+    "warranty_gaps",
+    "force_majeure_implications",
+)
+RISK_WEIGHTS = np.array([0.4, 0.2, 0.2, 0.2])
+
+# Placeholders for risk analyses that did not run, looked up behind the state
+_RISK_DEFAULTS = dict.fromkeys(RISK_FIELDS, "Not analyzed")
+
+# Phrases signalling exposure in a risk analysis, with the severity each adds.
+# Keys are regular expressions matched as whole words.
+RISK_LEXICON = {
+    "unlimited liability": 1.0,
+    "no cap": 1.0,
+    "uncapped": 1.0,
+    "consequential damages": 0.5,
+    r"indemnif\w*": 0.4,
+    "liquidated damages": 0.4,
+    r"penalt\w*": 0.4,
+    "without cause": 0.5,
+    "for convenience": 0.3,
+    "immediately": 0.3,
+    "sole discretion": 0.4,
+    "as is": 0.6,
+    "no warranty": 0.6,
+    r"disclaim\w*": 0.4,
+    "exclusive remedy": 0.3,
+    "not excused": 0.4,
+    "no force majeure": 0.6,
+}
+
+_RISK_PATTERNS = {
+    re.compile(rf"\b{term}\b"): weight for term, weight in RISK_LEXICON.items()
+}
+
+# Words that negate a phrase following them within the same clause
+_NEGATIONS = frozenset({"no", "not", "without"})
+# Number of words before a phrase searched for a negation
+NEGATION_WINDOW = 3
+_CLAUSE_BREAK = re.compile(r"[.,;:!?()\n]")
+
+# Lexicon severity at which a dimension counts as maximally risky
+RISK_SATURATION = 1.5
+
+# Analysis length, in characters, at which findings count with full weight;
+# shorter analyses scale their severity down
+RISK_LENGTH_NORMALIZATION = 400
+
+
+def _is_negated(text, start):
+    """Check whether a negation precedes position start within its clause."""
+    clause = _CLAUSE_BREAK.split(text[max(start - 60, 0) : start])[-1]
+
+    return not _NEGATIONS.isdisjoint(clause.split()[-NEGATION_WINDOW:])
+
+
+def score_component(text):
+    """
+    Estimate the severity of one risk dimension from its analysis text.
+
+    Each lexicon phrase counts once, provided at least one of its occurrences
+    is not negated, e.g. "no uncapped liability" does not count as uncapped.
+
+    Args:
+        text: Risk analysis produced by one of the risk analyzers
+
+    Returns:
+        float: Severity signal in [0, 1]
+    """
+    lowered = text.lower()
+    severity = sum(
+        weight
+        for pattern, weight in _RISK_PATTERNS.items()
+        if any(not _is_negated(lowered, m.start()) for m in pattern.finditer(lowered))
+    )
+    length_factor = min(len(text) / RISK_LENGTH_NORMALIZATION, 1.0)
+
+    return min(severity / RISK_SATURATION, 1.0) * length_factor
 
 
 # Liability analysis processor
 analyze_liability_risks = create_analysis_function(
-    LIABILITY_RISKS_TEMPLATE, "liability_risks"
+    LIABILITY_RISKS_TEMPLATE, "liability_risks", LIABILITY_RISKS_QUERY
 )
 
 # Termination conditions analysis processor
 analyze_termination_conditions = create_analysis_function(
-    TERMINATION_CONDITIONS_TEMPLATE, "termination_conditions"
+    TERMINATION_CONDITIONS_TEMPLATE,
+    "termination_conditions",
+    TERMINATION_CONDITIONS_QUERY,
 )
 
 # Warranty analysis processor
 analyze_warranty_gaps = create_analysis_function(
-    WARRANTY_GAPS_TEMPLATE, "warranty_gaps"
+    WARRANTY_GAPS_TEMPLATE, "warranty_gaps", WARRANTY_GAPS_QUERY
 )
 
 # Force majeure analysis processor
 analyze_force_majeure_implications = create_analysis_function(
-    FORCE_MAJEURE_TEMPLATE, "force_majeure_implications"
+    FORCE_MAJEURE_TEMPLATE, "force_majeure_implications", FORCE_MAJEURE_QUERY
+)
+
+# Fused processor covering all four risk dimensions in one call
+analyze_risk_track = create_analysis_function(
+    RISK_TRACK_TEMPLATE,
+    "risk_track",
+    (
+        LIABILITY_RISKS_QUERY,
+        TERMINATION_CONDITIONS_QUERY,
+        WARRANTY_GAPS_QUERY,
+        FORCE_MAJEURE_QUERY,
+    ),
+    RiskTrack,
 )
 
 
-def calculate_risk_score(state: LegalDocumentAnalyzerState):
+async def calculate_risk_score(state: LegalDocumentAnalyzerState):
     """
     Calculate a comprehensive risk score based on multiple risk dimensions.
 
     This function aggregates findings from the various risk analysis processors
-    and synthesizes them into a single, quantified risk assessment score.
+    and synthesizes them into a single, quantified risk assessment score. The
+    score is assessed by an LLM unless LLMConfig.USE_DETERMINISTIC_SCORING is
+    set, in which case it is computed from the weighted lexicon severity of each
+    dimension and the LLM is consulted only when no dimension contains a
+    recognized risk signal.
 
     Args:
         state: The current workflow state containing risk analysis results
@@ -64,17 +198,18 @@ def calculate_risk_score(state: LegalDocumentAnalyzerState):
     Returns:
         dict: Updated state with the calculated risk score
     """
-    # Prepare state with default values for missing keys
-    analysis_state = {
-        "document_type": state["document_type"],
-        "liability_risks": state.get("liability_risks", "Not analyzed"),
-        "termination_conditions": state.get("termination_conditions", "Not analyzed"),
-        "warranty_gaps": state.get("warranty_gaps", "Not analyzed"),
-        "force_majeure_implications": state.get(
-            "force_majeure_implications", "Not analyzed"
-        ),
-    }
-
-    res = call_structured_llm(analysis_state, RISK_SCORE_TEMPLATE, RiskScore)
-
-    return {"risk_score": res.score}
+    if LLMConfig.USE_DETERMINISTIC_SCORING:
+        signals = np.array([score_component(state.get(f) or "") for f in RISK_FIELDS])
+        # Without any lexicon match the heuristic is inconclusive, not risk-free
+        if signals.any():
+            return {
+                "risk_score": round(float(weighted_score(RISK_WEIGHTS, signals)), 1)
+            }
+
+    # Missing fields fall back to their placeholders without copying the state
+    analysis_state = ChainMap(state, _RISK_DEFAULTS)
+
+    res = await call_structured_llm(analysis_state, RISK_SCORE_TEMPLATE, RiskScore)
+
+    # The JSON parser does not coerce types, so normalize integer scores here
+    return {"risk_score": float(res["score"])}
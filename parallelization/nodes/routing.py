@@ -0,0 +1,138 @@
+"""
+Analysis Pipeline Routing
+
+This module decides which of the parallel analysis pipelines are worth running for
+a given document. Full contracts always receive every pipeline; for other document
+types a single inexpensive LLM call selects the relevant subset based on the
+document summary, so inapplicable analyses never reach the provider.
+"""
+
+from typing import Annotated, List, Literal, TypedDict
+
+from langgraph.types import Send
+
+from parallelization.state import LegalDocumentAnalyzerState
+from parallelization.prompts import PIPELINE_SELECTION_TEMPLATE
+from parallelization.utils import call_structured_llm, LLMConfig
+
+# Analysis nodes launched for each pipeline. Pipelines are dispatched as a whole so
+# the score nodes always receive every one of their inputs.
+ANALYSIS_PIPELINES = {
+    "obligations": (
+        "analyze_payment_obligations",
+        "analyze_delivery_timelines",
+        "analyze_reporting_requirements",
+        "analyze_performance_criteria",
+    ),
+    "risks": (
+        "analyze_liability_risks",
+        "analyze_termination_conditions",
+        "analyze_warranty_gaps",
+        "analyze_force_majeure_implications",
+    ),
+    "opportunities": (
+        "analyze_pricing_leverage_points",
+        "analyze_contract_extension_options",
+        "analyze_service_scope_expansion",
+        "analyze_early_termination_advantages",
+    ),
+    "definitions": ("extract_defined_terms",),
+    "cross_reference": (
+        "identify_direct_contradictions",
+        "identify_implied_inconsistencies",
+        "identify_sequential_commitment_issues",
+    ),
+}
+
+# Single-call variants of the four-analyzer pipelines, used when tracks are fused
+FUSED_PIPELINES = {
+    "obligations": ("analyze_obligations_track",),
+    "risks": ("analyze_risk_track",),
+    "opportunities": ("analyze_opportunity_track",),
+}
+
+ANALYSIS_NODES = tuple(
+    node
+    for pipelines in (ANALYSIS_PIPELINES, FUSED_PIPELINES)
+    for nodes in pipelines.values()
+    for node in nodes
+)
+
+# Document types that always run every pipeline without consulting the router
+FULL_ANALYSIS_DOCUMENT_TYPES = ("contract",)
+
+
+class PipelineSelection(TypedDict):
+    """
+    Structured output model for analysis pipeline routing.
+
+    Lists the pipelines whose subject matter is present in the document.
+    """
+
+    pipelines: Annotated[
+        List[
+            Literal[
+                "obligations",
+                "risks",
+                "opportunities",
+                "definitions",
+                "cross_reference",
+            ]
+        ],
+        ...,
+        "Analysis pipelines relevant to the document",
+    ]
+
+
+async def select_pipelines(state: LegalDocumentAnalyzerState):
+    """
+    Select the analysis pipelines relevant to the document.
+
+    Contracts skip the routing call and run every pipeline. Other document types
+    are routed by a small model reading only the document summary.
+
+    Args:
+        state: The current workflow state containing the document summary
+
+    Returns:
+        dict: Updated state with the names of the selected pipelines
+    """
+    if state["document_type"].strip().lower() in FULL_ANALYSIS_DOCUMENT_TYPES:
+        return {"selected_pipelines": list(ANALYSIS_PIPELINES)}
+
+    analysis_state = {
+        "document_type": state["document_type"],
+        "document_summary": state.get("document_summary", "No summary available"),
+    }
+
+    res = await call_structured_llm(
+        analysis_state,
+        PIPELINE_SELECTION_TEMPLATE,
+        PipelineSelection,
+        model=LLMConfig.ROUTER_MODEL,
+    )
+
+    # Never leave the workflow without analyses to aggregate
+    pipelines = list(dict.fromkeys(res["pipelines"])) or list(ANALYSIS_PIPELINES)
+
+    return {"selected_pipelines": pipelines}
+
+
+def dispatch_analyses(state: LegalDocumentAnalyzerState):
+    """
+    Fan out the document to every node of the selected analysis pipelines.
+
+    Args:
+        state: The current workflow state containing the selected pipelines
+
+    Returns:
+        list: Send packets, one per analysis node, each carrying the current state
+    """
+    pipelines = state.get("selected_pipelines") or list(ANALYSIS_PIPELINES)
+    nodes = (
+        {**ANALYSIS_PIPELINES, **FUSED_PIPELINES}
+        if LLMConfig.FUSED_TRACKS
+        else ANALYSIS_PIPELINES
+    )
+
+    return [Send(node, state) for pipeline in pipelines for node in nodes[pipeline]]
@@ -17,7 +17,7 @@ generate_document_summary = create_analysis_function(
 )
 
 # Można też użyć bezpośredniego podejścia:
-# def generate_document_summary(state: LegalDocumentAnalyzerState):
+# async def generate_document_summary(state: LegalDocumentAnalyzerState):
 #     """Generate a summary of the legal document."""
-#     result = call_llm_with_template(state, DOCUMENT_SUMMARY_TEMPLATE)
+#     result = await call_llm_with_template(state, DOCUMENT_SUMMARY_TEMPLATE)
 #     return {"document_summary": result}
@@ -7,13 +7,30 @@ Templates are organized by category and follow a consistent structure for better
 
 from langchain_core.prompts import PromptTemplate
 
+# Shared Request Prefix Templates
+# Every request starts with the system prefix followed by the document text, and
+# the task-specific template below is sent last. Keeping the long shared part of
+# the prompt byte-identical across analyzers lets the provider cache it.
+SYSTEM_PREFIX_TEMPLATE = PromptTemplate.from_template(
+    """
+    You are an expert legal analyst reviewing a legal document.
+    
+    DOCUMENT TYPE: {document_type}
+    """
+)
+
+DOCUMENT_TEXT_TEMPLATE = PromptTemplate.from_template(
+    """
+    DOCUMENT TEXT:
+    {document_text}
+    """
+)
+
 # Document Summary Templates
 DOCUMENT_SUMMARY_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Create a comprehensive yet concise summary of the following legal document.
-    
-    DOCUMENT TYPE: {document_type}
+    Create a comprehensive yet concise summary of the legal document provided above.
     
     REQUIREMENTS:
     - Provide an executive summary of the entire document
@@ -22,10 +39,30 @@ DOCUMENT_SUMMARY_TEMPLATE = PromptTemplate.from_template(
     - Note key dates, deadlines, and durations
     - Highlight any unusual or particularly important provisions
     
-    DOCUMENT TEXT:
-    {document_text}
+    DOCUMENT SUMMARY:
+    """
+)
+
+# Pipeline Routing Templates
+PIPELINE_SELECTION_TEMPLATE = PromptTemplate.from_template(
+    """
+    LEGAL DOCUMENT ROUTING TASK:
+    Based on the document summary below, select the analysis pipelines relevant to this legal document.
     
     DOCUMENT SUMMARY:
+    {document_summary}
+    
+    AVAILABLE PIPELINES:
+    - obligations: payment obligations, delivery timelines, reporting requirements, performance criteria
+    - risks: liability risks, termination conditions, warranty gaps, force majeure implications
+    - opportunities: pricing leverage, contract extensions, service scope expansion, early termination advantages
+    - definitions: defined terms and the consistency of their usage
+    - cross_reference: direct contradictions, implied inconsistencies, sequential commitment issues
+    
+    REQUIREMENTS:
+    - Select every pipeline whose subject matter is addressed by the document
+    - Skip a pipeline only when the document clearly contains nothing it could analyze
+    - When in doubt, include the pipeline
     """
 )
 
@@ -33,9 +70,7 @@ DOCUMENT_SUMMARY_TEMPLATE = PromptTemplate.from_template(
 PAYMENT_OBLIGATIONS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and extract all payment obligations.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and extract all payment obligations.
     
     REQUIREMENTS:
     - Identify all payment amounts, terms, and schedules
@@ -44,9 +79,6 @@ PAYMENT_OBLIGATIONS_TEMPLATE = PromptTemplate.from_template(
     - Note any payment security measures
     - Highlight any financial risks or unusual payment terms
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     PAYMENT OBLIGATIONS SUMMARY:
     """
 )
@@ -54,9 +86,7 @@ PAYMENT_OBLIGATIONS_TEMPLATE = PromptTemplate.from_template(
 DELIVERY_TIMELINES_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and extract all delivery timelines.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and extract all delivery timelines.
     
     REQUIREMENTS:
     - Identify all delivery dates and milestone deadlines
@@ -65,9 +95,6 @@ DELIVERY_TIMELINES_TEMPLATE = PromptTemplate.from_template(
     - Note any extension provisions
     - Highlight any timeline risks or impractical deadlines
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     DELIVERY TIMELINES SUMMARY:
     """
 )
@@ -75,9 +102,7 @@ DELIVERY_TIMELINES_TEMPLATE = PromptTemplate.from_template(
 REPORTING_REQUIREMENTS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and extract all reporting requirements.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and extract all reporting requirements.
     
     REQUIREMENTS:
     - Identify all required reports and notifications
@@ -86,9 +111,6 @@ REPORTING_REQUIREMENTS_TEMPLATE = PromptTemplate.from_template(
     - Note any consequences for missed reporting
     - Highlight any unusual or burdensome reporting requirements
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     REPORTING REQUIREMENTS SUMMARY:
     """
 )
@@ -96,9 +118,7 @@ REPORTING_REQUIREMENTS_TEMPLATE = PromptTemplate.from_template(
 PERFORMANCE_CRITERIA_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and extract all performance criteria.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and extract all performance criteria.
     
     REQUIREMENTS:
     - Identify all performance standards and metrics
@@ -107,9 +127,6 @@ PERFORMANCE_CRITERIA_TEMPLATE = PromptTemplate.from_template(
     - Note any performance monitoring mechanisms
     - Highlight any unrealistic or vague performance expectations
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     PERFORMANCE CRITERIA SUMMARY:
     """
 )
@@ -118,9 +135,7 @@ PERFORMANCE_CRITERIA_TEMPLATE = PromptTemplate.from_template(
 LIABILITY_RISKS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and extract all liability risks.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and extract all liability risks.
     
     REQUIREMENTS:
     - Identify all clauses that assign, limit, or exclude liability
@@ -129,9 +144,6 @@ LIABILITY_RISKS_TEMPLATE = PromptTemplate.from_template(
     - Analyze any insurance requirements
     - Highlight particularly concerning liability exposures
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     LIABILITY RISKS SUMMARY:
     """
 )
@@ -139,9 +151,7 @@ LIABILITY_RISKS_TEMPLATE = PromptTemplate.from_template(
 TERMINATION_CONDITIONS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and extract all termination conditions.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and extract all termination conditions.
     
     REQUIREMENTS:
     - Identify all circumstances under which the agreement can be terminated
@@ -150,9 +160,6 @@ TERMINATION_CONDITIONS_TEMPLATE = PromptTemplate.from_template(
     - Analyze any consequences or penalties for early termination
     - Note any post-termination obligations
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     TERMINATION CONDITIONS SUMMARY:
     """
 )
@@ -160,9 +167,7 @@ TERMINATION_CONDITIONS_TEMPLATE = PromptTemplate.from_template(
 WARRANTY_GAPS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and identify any warranty gaps or limitations.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and identify any warranty gaps or limitations.
     
     REQUIREMENTS:
     - Identify all warranties provided and their scope
@@ -171,9 +176,6 @@ WARRANTY_GAPS_TEMPLATE = PromptTemplate.from_template(
     - Analyze warranty periods and any conditions
     - Highlight particularly concerning warranty limitations
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     WARRANTY GAPS SUMMARY:
     """
 )
@@ -181,9 +183,7 @@ WARRANTY_GAPS_TEMPLATE = PromptTemplate.from_template(
 FORCE_MAJEURE_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and extract force majeure clauses and their implications.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and extract force majeure clauses and their implications.
     
     REQUIREMENTS:
     - Identify any force majeure clauses and their scope
@@ -192,9 +192,6 @@ FORCE_MAJEURE_TEMPLATE = PromptTemplate.from_template(
     - Identify any notification requirements
     - Note any time limitations on force majeure protections
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     FORCE MAJEURE IMPLICATIONS SUMMARY:
     """
 )
@@ -203,9 +200,7 @@ FORCE_MAJEURE_TEMPLATE = PromptTemplate.from_template(
 PRICING_LEVERAGE_POINTS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and identify pricing leverage points.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and identify pricing leverage points.
     
     REQUIREMENTS:
     - Identify favorable pricing terms and conditions
@@ -214,9 +209,6 @@ PRICING_LEVERAGE_POINTS_TEMPLATE = PromptTemplate.from_template(
     - Analyze payment term flexibility
     - Note any pricing renegotiation opportunities
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     PRICING LEVERAGE POINTS SUMMARY:
     """
 )
@@ -224,9 +216,7 @@ PRICING_LEVERAGE_POINTS_TEMPLATE = PromptTemplate.from_template(
 CONTRACT_EXTENSION_OPTIONS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and identify contract extension options.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and identify contract extension options.
     
     REQUIREMENTS:
     - Identify any renewal or extension clauses
@@ -235,9 +225,6 @@ CONTRACT_EXTENSION_OPTIONS_TEMPLATE = PromptTemplate.from_template(
     - Identify any auto-renewal provisions
     - Note any limitations on the number of extensions
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     CONTRACT EXTENSION OPTIONS SUMMARY:
     """
 )
@@ -245,9 +232,7 @@ CONTRACT_EXTENSION_OPTIONS_TEMPLATE = PromptTemplate.from_template(
 SERVICE_SCOPE_EXPANSION_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and identify service scope expansion opportunities.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and identify service scope expansion opportunities.
     
     REQUIREMENTS:
     - Identify any clauses that allow for expanded service offerings
@@ -256,9 +241,6 @@ SERVICE_SCOPE_EXPANSION_TEMPLATE = PromptTemplate.from_template(
     - Identify any limitations on scope expansion
     - Note any pricing considerations for expanded services
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     SERVICE SCOPE EXPANSION SUMMARY:
     """
 )
@@ -266,9 +248,7 @@ SERVICE_SCOPE_EXPANSION_TEMPLATE = PromptTemplate.from_template(
 EARLY_TERMINATION_ADVANTAGES_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and identify any early termination advantages.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and identify any early termination advantages.
     
     REQUIREMENTS:
     - Identify any favorable early termination rights
@@ -277,9 +257,6 @@ EARLY_TERMINATION_ADVANTAGES_TEMPLATE = PromptTemplate.from_template(
     - Identify notice periods required for termination
     - Note any post-termination benefits or obligations
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     EARLY TERMINATION ADVANTAGES SUMMARY:
     """
 )
@@ -288,9 +265,7 @@ EARLY_TERMINATION_ADVANTAGES_TEMPLATE = PromptTemplate.from_template(
 DEFINED_TERMS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Extract and categorize defined terms from the following legal document.
-    
-    DOCUMENT TYPE: {document_type}
+    Extract and categorize defined terms from the legal document provided above.
     
     REQUIREMENTS:
     - Identify terms that are explicitly defined in the document
@@ -298,9 +273,6 @@ DEFINED_TERMS_TEMPLATE = PromptTemplate.from_template(
     - For each term, provide its precise definition as stated in the document
     - Format as a structured dictionary with term:definition pairs
     - Include ALL defined terms, even if there are many
-    
-    DOCUMENT TEXT:
-    {document_text}
     """
 )
 
@@ -309,8 +281,6 @@ DEFINITION_CONSISTENCY_TEMPLATE = PromptTemplate.from_template(
     LEGAL DOCUMENT ANALYSIS TASK:
     Analyze the consistency of defined terms throughout the legal document.
     
-    DOCUMENT TYPE: {document_type}
-    
     DEFINED TERMS:
     {terms_text}
     
@@ -321,9 +291,6 @@ DEFINITION_CONSISTENCY_TEMPLATE = PromptTemplate.from_template(
     - Note any overlapping or contradictory definitions
     - List each consistency issue as a separate point
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     DEFINITION CONSISTENCY ISSUES:
     """
 )
@@ -332,9 +299,7 @@ DEFINITION_CONSISTENCY_TEMPLATE = PromptTemplate.from_template(
 DIRECT_CONTRADICTIONS_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and identify any direct contradictions.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and identify any direct contradictions.
     
     REQUIREMENTS:
     - Identify statements that directly contradict each other
@@ -343,9 +308,6 @@ DIRECT_CONTRADICTIONS_TEMPLATE = PromptTemplate.from_template(
     - Focus on statements that are explicitly in conflict, not just potentially inconsistent
     - List each contradiction as a separate point
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     DIRECT CONTRADICTIONS:
     """
 )
@@ -353,9 +315,7 @@ DIRECT_CONTRADICTIONS_TEMPLATE = PromptTemplate.from_template(
 IMPLIED_INCONSISTENCIES_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and identify any implied inconsistencies.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and identify any implied inconsistencies.
     
     REQUIREMENTS:
     - Identify statements that, while not directly contradictory, create logical inconsistencies
@@ -364,9 +324,6 @@ IMPLIED_INCONSISTENCIES_TEMPLATE = PromptTemplate.from_template(
     - Focus on logical conflicts that could create ambiguity in interpretation
     - List each inconsistency as a separate point
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     IMPLIED INCONSISTENCIES:
     """
 )
@@ -374,9 +331,7 @@ IMPLIED_INCONSISTENCIES_TEMPLATE = PromptTemplate.from_template(
 SEQUENTIAL_COMMITMENT_ISSUES_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Analyze the following legal document and identify any sequential commitment issues.
-    
-    DOCUMENT TYPE: {document_type}
+    Analyze the legal document provided above and identify any sequential commitment issues.
     
     REQUIREMENTS:
     - Identify timeline or sequence conflicts in commitments
@@ -385,62 +340,124 @@ SEQUENTIAL_COMMITMENT_ISSUES_TEMPLATE = PromptTemplate.from_template(
     - Note any deadlines that conflict with each other
     - List each sequential issue as a separate point
     
-    DOCUMENT TEXT:
-    {document_text}
-    
     SEQUENTIAL COMMITMENT ISSUES:
     """
 )
 
-# Aggregation Templates
-KEY_INSIGHTS_TEMPLATE = PromptTemplate.from_template(
+# Fused Track Templates
+# Each covers a whole pipeline track in one structured call when FUSED_TRACKS is enabled
+OBLIGATIONS_TRACK_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Based on the analyses below, extract the key insights from this legal document.
+    Analyze the legal document provided above and extract its financial and operational obligations.
+    Report each of the areas below in its own field.
     
-    DOCUMENT TYPE: {document_type}
+    PAYMENT OBLIGATIONS (payment_obligations):
+    - Identify all payment amounts, terms, and schedules
+    - Note any conditions precedent to payment
+    - Identify any penalties or discounts related to payment
+    - Note any payment security measures
+    - Highlight any financial risks or unusual payment terms
     
-    ANALYSES:
-    {analyses_text}
+    DELIVERY TIMELINES (delivery_timelines):
+    - Identify all delivery dates and milestone deadlines
+    - Note any conditions that might affect the timeline
+    - Identify any penalties or consequences for delayed delivery
+    - Note any extension provisions
+    - Highlight any timeline risks or impractical deadlines
     
-    REQUIREMENTS:
-    - Identify up to 10 most important insights from the analyses
-    - Focus on high-impact observations that would be valuable to a decision maker
-    - Include both risks and opportunities in your insights
-    - Be concise and specific for each insight
-    - Each insight should be a separate line item
+    REPORTING REQUIREMENTS (reporting_requirements):
+    - Identify all required reports and notifications
+    - Note frequency and deadlines for each report
+    - Identify the required content and format of reports
+    - Note any consequences for missed reporting
+    - Highlight any unusual or burdensome reporting requirements
+    
+    PERFORMANCE CRITERIA (performance_criteria):
+    - Identify all performance standards and metrics
+    - Note any service level agreements (SLAs)
+    - Identify any penalties or bonuses tied to performance
+    - Note any performance monitoring mechanisms
+    - Highlight any unrealistic or vague performance expectations
     """
 )
 
-CRITICAL_ISSUES_TEMPLATE = PromptTemplate.from_template(
+RISK_TRACK_TEMPLATE = PromptTemplate.from_template(
     """
     LEGAL DOCUMENT ANALYSIS TASK:
-    Based on the analyses below, identify critical issues that require immediate attention.
+    Analyze the legal document provided above and assess its risk provisions.
+    Report each of the areas below in its own field.
     
-    DOCUMENT TYPE: {document_type}
+    LIABILITY RISKS (liability_risks):
+    - Identify all clauses that assign, limit, or exclude liability
+    - Note any caps on liability amounts
+    - Identify any indemnification clauses
+    - Analyze any insurance requirements
+    - Highlight particularly concerning liability exposures
     
-    ANALYSES:
-    {issues_text}
+    TERMINATION CONDITIONS (termination_conditions):
+    - Identify all circumstances under which the agreement can be terminated
+    - Note any termination for convenience clauses
+    - Identify notice periods required for termination
+    - Analyze any consequences or penalties for early termination
+    - Note any post-termination obligations
     
-    RISK SCORE: {risk_score}
+    WARRANTY GAPS (warranty_gaps):
+    - Identify all warranties provided and their scope
+    - Note any warranty disclaimers or limitations
+    - Identify standard warranties that might be missing
+    - Analyze warranty periods and any conditions
+    - Highlight particularly concerning warranty limitations
     
-    REQUIREMENTS:
-    - Identify 3-5 most critical issues that require immediate attention
-    - Focus on issues with high potential impact or legal exposure
-    - Each critical issue should be a separate line item
-    - For each issue, include a brief explanation of why it's critical
-    - Focus only on truly critical issues, not minor concerns
+    FORCE MAJEURE IMPLICATIONS (force_majeure_implications):
+    - Identify any force majeure clauses and their scope
+    - Note what events are specifically included or excluded
+    - Analyze the consequences of a force majeure event
+    - Identify any notification requirements
+    - Note any time limitations on force majeure protections
     """
 )
 
-MARKDOWN_REPORT_TEMPLATE = PromptTemplate.from_template(
+OPPORTUNITY_TRACK_TEMPLATE = PromptTemplate.from_template(
     """
-    COMPREHENSIVE LEGAL DOCUMENT ANALYSIS REPORT TASK:
+    LEGAL DOCUMENT ANALYSIS TASK:
+    Analyze the legal document provided above and identify its strategic opportunities.
+    Report each of the areas below in its own field.
     
-    Create a detailed, well-structured markdown report based on the complete analysis of this legal document.
+    PRICING LEVERAGE POINTS (pricing_leverage_points):
+    - Identify favorable pricing terms and conditions
+    - Note any price adjustment mechanisms that could be advantageous
+    - Identify any volume discounts or incentives
+    - Analyze payment term flexibility
+    - Note any pricing renegotiation opportunities
     
-    DOCUMENT TYPE: {document_type}
+    CONTRACT EXTENSION OPTIONS (contract_extension_options):
+    - Identify any renewal or extension clauses
+    - Note the conditions required for extensions
+    - Analyze any price adjustments tied to extensions
+    - Identify any auto-renewal provisions
+    - Note any limitations on the number of extensions
     
+    SERVICE SCOPE EXPANSION (service_scope_expansion):
+    - Identify any clauses that allow for expanded service offerings
+    - Note any upsell or cross-sell opportunities defined in the agreement
+    - Analyze any mechanisms for adding new services
+    - Identify any limitations on scope expansion
+    - Note any pricing considerations for expanded services
+    
+    EARLY TERMINATION ADVANTAGES (early_termination_advantages):
+    - Identify any favorable early termination rights
+    - Note any circumstances where early termination would be advantageous
+    - Analyze penalties or costs associated with early termination
+    - Identify notice periods required for termination
+    - Note any post-termination benefits or obligations
+    """
+)
+
+# Aggregation Templates
+# Both synthesis prompts open with the same analyses block, so the second request
+# can reuse the provider's cached prefix of the first
+_ANALYSES_OVERVIEW = """
     AVAILABLE ANALYSES:
     
     DOCUMENT SUMMARY:
@@ -449,12 +466,6 @@ MARKDOWN_REPORT_TEMPLATE = PromptTemplate.from_template(
     RISK SCORE: {risk_score}/100
     OPPORTUNITY SCORE: {opportunity_score}/100
     
-    KEY INSIGHTS:
-    {key_insights}
-    
-    CRITICAL ISSUES:
-    {critical_issues}
-    
     OBLIGATIONS:
     - Payment Obligations: {payment_obligations}
     - Delivery Timelines: {delivery_timelines}
@@ -482,16 +493,58 @@ MARKDOWN_REPORT_TEMPLATE = PromptTemplate.from_template(
     - Direct Contradictions: {direct_contradictions}
     - Implied Inconsistencies: {implied_inconsistencies}
     - Sequential Commitment Issues: {sequential_commitment_issues}
+"""
+
+KEY_FINDINGS_TEMPLATE = PromptTemplate.from_template(
+    _ANALYSES_OVERVIEW
+    + """
+    KEY FINDINGS TASK:
     
-    REQUIREMENTS:
+    Based on the complete analysis of this legal document above, extract the key
+    insights and identify the critical issues.
+    
+    KEY INSIGHTS REQUIREMENTS:
+    - Identify up to 10 most important insights from the analyses
+    - Focus on high-impact observations that would be valuable to a decision maker
+    - Include both risks and opportunities in your insights
+    - Be concise and specific for each insight
+    - Each insight should be a separate line item
+    
+    CRITICAL ISSUES REQUIREMENTS:
+    - Identify 3-5 most critical issues that require immediate attention
+    - Focus on risks, definition issues and cross-reference issues with high potential impact or legal exposure
+    - Each critical issue should be a separate line item
+    - For each issue, include a brief explanation of why it's critical
+    - Focus only on truly critical issues, not minor concerns
+    """
+)
+
+MARKDOWN_REPORT_TEMPLATE = PromptTemplate.from_template(
+    _ANALYSES_OVERVIEW
+    + """
+    KEY INSIGHTS:
+    {key_insights}
+    
+    CRITICAL ISSUES:
+    {critical_issues}
+    
+    MARKDOWN REPORT TASK:
+    
+    Based on the complete analysis of this legal document above, create a detailed,
+    well-structured markdown report.
+    
+    MARKDOWN REPORT REQUIREMENTS:
     1. Create a professional, well-structured markdown report with proper headings, sections, and formatting
     2. Include an executive summary at the beginning with overall assessment and key metrics
-    3. Organize findings by category (risks, obligations, opportunities, etc.)
-    4. Prioritize issues by severity/importance within each section
-    5. Include specific references to document sections/clauses where relevant
-    6. Add a conclusion with recommendations for next steps
-    7. Use markdown formatting effectively (headers, lists, bold for emphasis, tables if appropriate)
-    8. Make the report easily scannable for executives
+    3. Incorporate the key insights and critical issues listed above
+    4. Organize findings by category (risks, obligations, opportunities, etc.)
+    5. Prioritize issues by severity/importance within each section
+    6. Include specific references to document sections/clauses where relevant
+    7. Add a conclusion with recommendations for next steps
+    8. Use markdown formatting effectively (headers, lists, bold for emphasis, tables if appropriate)
+    9. Make the report easily scannable for executives
+    
+    Respond with the markdown report only.
     """
 )
 
@@ -501,8 +554,6 @@ RISK_SCORE_TEMPLATE = PromptTemplate.from_template(
     LEGAL DOCUMENT RISK ASSESSMENT TASK:
     Based on the analyses below, calculate an overall risk score for this legal document.
     
-    DOCUMENT TYPE: {document_type}
-    
     ANALYSES:
     1. LIABILITY RISKS:
     {liability_risks}
@@ -528,8 +579,6 @@ OPPORTUNITY_SCORE_TEMPLATE = PromptTemplate.from_template(
     LEGAL DOCUMENT OPPORTUNITY ASSESSMENT TASK:
     Based on the analyses below, calculate an overall opportunity score for this legal document.
     
-    DOCUMENT TYPE: {document_type}
-    
     ANALYSES:
     1. PRICING LEVERAGE POINTS:
     {pricing_leverage_points}
@@ -549,3 +598,61 @@ OPPORTUNITY_SCORE_TEMPLATE = PromptTemplate.from_template(
     - Provide a brief explanation of the opportunity assessment
     """
 )
+
+# Semantic Cache Templates
+PATTERN_ADAPTATION_TEMPLATE = PromptTemplate.from_template(
+    """
+    ANALYSIS ADAPTATION TASK:
+    
+    The reference analysis below was written for a very similar {document_type}.
+    Adapt it so that it accurately describes the legal document provided above.
+    
+    REQUIREMENTS:
+    - Keep the structure, format and level of detail of the reference analysis
+    - Update every party name, amount, date and clause reference to match the document
+    - Remove findings that do not apply to the document and add any that are missing
+    - Do not mention the reference analysis
+    
+    REFERENCE ANALYSIS:
+    {reference_analysis}
+    
+    ADAPTED ANALYSIS:
+    """
+)
+
+# Retrieval Seed Queries
+# Focused analyzers receive only the document chunks most similar to their query
+PAYMENT_OBLIGATIONS_QUERY = (
+    "payment amounts fees invoices payment schedule late payment interest penalties"
+)
+DELIVERY_TIMELINES_QUERY = (
+    "delivery dates milestones deadlines schedule delays extensions of time"
+)
+REPORTING_REQUIREMENTS_QUERY = (
+    "reports reporting frequency submission notices audits records documentation"
+)
+PERFORMANCE_CRITERIA_QUERY = (
+    "service levels performance standards metrics acceptance criteria remedies"
+)
+LIABILITY_RISKS_QUERY = (
+    "liability limitation of liability indemnification damages insurance caps"
+)
+TERMINATION_CONDITIONS_QUERY = (
+    "termination for cause convenience breach notice period cure effects of termination"
+)
+WARRANTY_GAPS_QUERY = "warranties representations disclaimers exclusions remedies"
+FORCE_MAJEURE_QUERY = (
+    "force majeure events beyond reasonable control suspension excuse of performance"
+)
+PRICING_LEVERAGE_POINTS_QUERY = (
+    "pricing rates discounts price adjustments most favored customer volume"
+)
+CONTRACT_EXTENSION_OPTIONS_QUERY = (
+    "term renewal extension option automatic renewal notice of non-renewal"
+)
+SERVICE_SCOPE_EXPANSION_QUERY = (
+    "scope of services additional services change orders statements of work"
+)
+EARLY_TERMINATION_ADVANTAGES_QUERY = (
+    "early termination termination for convenience termination fees refunds exit"
+)
@@ -11,12 +11,23 @@ class LegalDocumentAnalyzerState(TypedDict, total=False):
     """
 
     # Document inputs
-    document_text: str  # Complete text content of the legal document
+    doc_id: str  # Key of the document text, chunks and embeddings in the store
+    document_text: Optional[
+        str
+    ]  # Document text when passed directly; moved to the store on entry
+    document_owned: Optional[
+        bool
+    ]  # Whether the workflow stored the document itself and releases it on exit
     document_type: str  # Document classification (contract, agreement, NDA, etc.)
 
     # Document summary
     document_summary: Optional[str]  # Executive summary with key document highlights
 
+    # Pipeline routing
+    selected_pipelines: Optional[
+        List[str]
+    ]  # Analysis pipelines chosen for the document
+
     # Financial and Operational Obligations
     payment_obligations: Optional[
         str
@@ -0,0 +1,108 @@
+"""
+Document Store
+
+This module keeps the bulky per-document data of the Legal Document Analysis
+workflow out of the graph state. LangGraph copies the state into every parallel
+branch and, when a checkpointer is attached, serializes it after every super-step.
+Keeping the document text, chunks and embeddings here and only a short doc_id in
+the state means each step carries a few bytes instead of the whole document.
+
+The store is an in-process dictionary; a multi-process deployment would back the
+same functions with a shared store such as Redis.
+"""
+
+import uuid
+
+import numpy as np
+
+# Documents stay until release_document is called, so a document is never dropped
+# while its analysis is still running
+_DOCUMENTS = {}
+
+
+def put_document(document_text):
+    """
+    Store a document and return the key under which it can be retrieved.
+
+    Args:
+        document_text: Complete text content of the legal document
+
+    Returns:
+        str: The doc_id to keep in the workflow state
+    """
+    doc_id = uuid.uuid4().hex
+    _DOCUMENTS[doc_id] = {"document_text": document_text}
+
+    return doc_id
+
+
+def get_document(doc_id):
+    """
+    Return the text of a stored document.
+
+    Args:
+        doc_id: Key returned by put_document
+
+    Returns:
+        str: Complete text content of the legal document
+    """
+    return _DOCUMENTS[doc_id]["document_text"]
+
+
+def put_chunks(doc_id, chunks, embeddings):
+    """
+    Attach the retrieval chunks and their embeddings to a stored document.
+
+    Args:
+        doc_id: Key returned by put_document
+        chunks: Document text split into retrieval chunks
+        embeddings: Embeddings of each chunk (empty when the document is short)
+    """
+    _DOCUMENTS[doc_id]["document_chunks"] = chunks
+    # Converted once here rather than by every analyzer that retrieves from them
+    _DOCUMENTS[doc_id]["chunk_embeddings"] = (
+        np.asarray(embeddings) if embeddings else None
+    )
+
+
+def get_chunks(doc_id):
+    """
+    Return the retrieval chunks of a stored document.
+
+    Args:
+        doc_id: Key returned by put_document
+
+    Returns:
+        tuple: The list of chunks and their embedding matrix, or None in place of
+        the matrix when the document was not embedded
+    """
+    document = _DOCUMENTS[doc_id]
+
+    return document.get("document_chunks", []), document.get("chunk_embeddings")
+
+
+def get_derived_values(doc_id):
+    """
+    Return the memo of values derived from a stored document.
+
+    Values computed from the document text, such as its rendered prompt messages,
+    are kept here instead of in process-wide caches, so they are dropped together
+    with the document when it is released.
+
+    Args:
+        doc_id: Key returned by put_document
+
+    Returns:
+        dict: Mutable mapping owned by the stored document
+    """
+    return _DOCUMENTS[doc_id].setdefault("derived_values", {})
+
+
+def release_document(doc_id):
+    """
+    Drop a stored document once its analysis has finished.
+
+    Args:
+        doc_id: Key returned by put_document
+    """
+    _DOCUMENTS.pop(doc_id, None)
@@ -7,8 +7,40 @@ for LLM interactions with consistent error handling, templating, and
 structured output parsing.
 """
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
+import asyncio
+import hashlib
+import json
+import os
+from functools import cache, lru_cache
+
+import httpx
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the scorer then runs as plain Python
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+try:
+    import h2  # noqa: F401 - httpx needs it to negotiate HTTP/2
+except ImportError:  # h2 is optional; the pool then falls back to HTTP/1.1
+    h2 = None
+
+from langchain_community.cache import SQLiteCache
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from parallelization.cache import SemanticCache
+from shared.event_loop import per_event_loop
+from parallelization.store import get_chunks, get_derived_values, get_document
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_core.messages import HumanMessage, SystemMessage
+from parallelization.prompts import (
+    DOCUMENT_TEXT_TEMPLATE,
+    PATTERN_ADAPTATION_TEMPLATE,
+    SYSTEM_PREFIX_TEMPLATE,
+)
 from typing import Any, Dict, List, Type
 
 
@@ -22,91 +54,663 @@ class LLMConfig:
 
     DEFAULT_MODEL = "gpt-4.1-mini"
     DEFAULT_TEMPERATURE = 0
+    # Small, inexpensive model for routing decisions
+    ROUTER_MODEL = "gpt-4.1-nano"
+    # Cheaper model for the focused extraction analyzers, which dominate the fan-out
+    EXTRACTION_MODEL = "gpt-4.1-nano"
+    # Stronger model reserved for the final synthesis of all analyses
+    SYNTHESIS_MODEL = DEFAULT_MODEL
+
+    # Upper bound on concurrently running nodes, sized to stay under provider rate limits
+    MAX_CONCURRENCY = 8
+    # Cap on in-flight LLM requests across every document analyzed by the process,
+    # so concurrent workflows queue instead of tripping rate limits and retrying
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("LLM_CONCURRENCY", "32"))
+    # Attempts per node before a transient provider error fails the workflow
+    MAX_RETRY_ATTEMPTS = 3
+
+    # Connection pool shared by all LLM clients, kept warm across requests
+    MAX_CONNECTIONS = 100
+    MAX_KEEPALIVE_CONNECTIONS = 50
+
+    # Opt-in persistent response cache, so development reruns and CI replays of a
+    # document skip repeated LLM calls
+    CACHE_ENABLED = os.getenv("LLM_CACHE", "0") == "1"
+    CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".llm_cache.db")
+
+    # Opt-in semantic cache that reuses analyses of near-duplicate documents
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE", "0") == "1"
+    SEMANTIC_CACHE_THRESHOLD = 0.97
+    # Less similar documents still reuse a cached analysis as a pattern to adapt
+    SEMANTIC_PATTERN_THRESHOLD = 0.9
+    SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", ".semantic_cache.db")
+    SEMANTIC_CACHE_MAX_ENTRIES = 256
+    EMBEDDING_MODEL = "text-embedding-3-small"
+
+    # Document chunking, so focused analyzers receive only their relevant sections
+    CHUNK_SIZE = 1500
+    CHUNK_OVERLAP = 150
+    RETRIEVAL_TOP_K = 5
+
+    # Opt-in fusion of each four-analyzer pipeline track into one structured call,
+    # trading a longer generation per track for a quarter of the requests
+    FUSED_TRACKS = os.getenv("FUSED_TRACKS", "0") == "1"
+
+    # Opt-in arithmetic scoring over the extracted analyses instead of an LLM call;
+    # the LLM is still consulted when the analyses give the heuristics nothing to go on
+    USE_DETERMINISTIC_SCORING = os.getenv("DETERMINISTIC_SCORING", "0") == "1"
+
+
+@cache
+def get_llm_cache():
+    """
+    Return the persistent response cache shared by all workflow LLM calls.
+
+    Responses are stored in SQLite keyed on the rendered prompt together with the
+    model parameters (model, temperature, structured output schema), so an
+    identical request is answered locally instead of calling the provider.
+
+    Returns:
+        SQLiteCache | None: The cache, or None when caching is disabled
+    """
+    if not LLMConfig.CACHE_ENABLED:
+        return None
+
+    return SQLiteCache(database_path=LLMConfig.CACHE_PATH)
+
+
+def _http_client_options():
+    """Return the connection pool options shared by the sync and async clients."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=LLMConfig.MAX_CONNECTIONS,
+            max_keepalive_connections=LLMConfig.MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        "http2": h2 is not None,
+    }
+
+
+@cache
+def get_http_client():
+    """
+    Return the pooled synchronous HTTP client shared by every LLM client.
+
+    Reusing one connection pool keeps keep-alive connections to the provider
+    open, so requests skip the TCP and TLS handshakes after the first call.
+    When h2 is installed the clients speak HTTP/2, multiplexing the parallel
+    analyzer requests over a single connection.
+
+    Returns:
+        httpx.Client: The shared client
+    """
+    return httpx.Client(**_http_client_options())
+
+
+@per_event_loop
+def get_async_http_client():
+    """
+    Return the pooled async HTTP client of the running event loop.
+
+    Returns:
+        httpx.AsyncClient: The client shared by every LLM request on the loop
+    """
+    return httpx.AsyncClient(**_http_client_options())
+
+
+@per_event_loop
+def get_llm(model, temperature):
+    """
+    Return the chat model client for a model and temperature.
+
+    Clients are constructed once per event loop and reused, instead of re-reading
+    configuration and rebuilding the underlying OpenAI client on every call.
+
+    Args:
+        model: LLM model identifier
+        temperature: Sampling temperature for response generation
+
+    Returns:
+        ChatOpenAI: The shared client
+    """
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        cache=get_llm_cache(),
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+    )
+
+
+@per_event_loop
+def get_structured_llm(model, temperature, output_class):
+    """
+    Return the chat model client bound to a structured output schema.
+
+    Binding converts the TypedDict schema to a JSON response format, so the bound
+    runnable is cached per schema rather than rebuilt on every call. Responses
+    are parsed into plain dicts, without instantiating a validation model.
+
+    Args:
+        model: LLM model identifier
+        temperature: Sampling temperature for response generation
+        output_class: TypedDict class defining the expected response structure
+
+    Returns:
+        Runnable: The client producing dicts shaped like output_class
+    """
+    return get_llm(model, temperature).with_structured_output(output_class)
+
+
+@cache
+def get_semantic_cache():
+    """
+    Return the process-wide semantic cache for document analyses.
+
+    Returns:
+        SemanticCache | None: The cache, or None when semantic caching is disabled
+    """
+    if not LLMConfig.SEMANTIC_CACHE_ENABLED:
+        return None
+
+    return SemanticCache(
+        embeddings=get_embeddings,
+        threshold=LLMConfig.SEMANTIC_CACHE_THRESHOLD,
+        max_entries=LLMConfig.SEMANTIC_CACHE_MAX_ENTRIES,
+        path=LLMConfig.SEMANTIC_CACHE_PATH,
+    )
+
+
+def _build_prefix_messages(document_type, document_text):
+    """
+    Build the system prefix and document messages of a request.
+
+    Args:
+        document_type: Document classification used in the system prefix
+        document_text: Document text (or retrieved excerpt), or None to omit it
+
+    Returns:
+        tuple: The system message, followed by the document message when provided
+    """
+    messages = (
+        SystemMessage(
+            content=SYSTEM_PREFIX_TEMPLATE.format(document_type=document_type)
+        ),
+    )
+
+    if document_text:
+        messages += (
+            HumanMessage(
+                content=DOCUMENT_TEXT_TEMPLATE.format(document_text=document_text)
+            ),
+        )
+
+    return messages
+
+
+@lru_cache(maxsize=64)
+def _static_task_message(template_text):
+    """Render a task template without input variables once, on first use."""
+    return HumanMessage(content=template_text.format())
+
+
+def _build_task_message(template_values, template):
+    """
+    Render the task-specific message of a request.
+
+    Most task templates take no variables beyond the shared prefix, so their
+    message is rendered once and reused. The rest substitute the template values
+    directly with str.format_map, skipping PromptTemplate's per-call input
+    validation and the copy of the values into keyword arguments.
+
+    Args:
+        template_values: Mapping of values to populate the template
+        template: Task-specific f-string PromptTemplate
+
+    Returns:
+        HumanMessage: The rendered task message
+    """
+    if template.partial_variables:
+        return HumanMessage(content=template.format(**template_values))
+    if not template.input_variables:
+        return _static_task_message(template.template)
+
+    return HumanMessage(content=template.template.format_map(template_values))
+
+
+def build_prompt_messages(template_values, template):
+    """
+    Assemble the chat messages for a templated LLM request.
+
+    Requests are laid out as [system prefix, document text, task template] so the
+    long, shared part of the prompt comes first and is byte-identical for every
+    analyzer working on the same document. This lets the provider's automatic
+    prompt caching reuse it, while the task-specific instructions vary only in
+    the final message.
+
+    Args:
+        template_values: Dictionary of values to populate the templates; the
+            document message is included only when it provides document_text
+        template: Task-specific PromptTemplate from the prompts module
+
+    Returns:
+        list: Messages ready to be passed to a chat model
+    """
+    document_type = template_values["document_type"]
+    document_text = template_values.get("document_text")
+    doc_id = template_values.get("doc_id")
+
+    # Every analyzer sending the full document shares the same prefix, so it is
+    # rendered once per document and dropped when the document is released
+    if doc_id and document_text and document_text is get_document(doc_id):
+        derived = get_derived_values(doc_id)
+        key = ("prefix_messages", document_type)
+        if key not in derived:
+            derived[key] = _build_prefix_messages(document_type, document_text)
+        prefix = derived[key]
+    else:
+        prefix = _build_prefix_messages(document_type, document_text)
+
+    return [*prefix, _build_task_message(template_values, template)]
+
+
+def document_cache_key(doc_id):
+    """
+    Return the provider prompt cache key of a stored document.
+
+    Every request about the same document, whether it sends the full text or a
+    retrieved excerpt, passes this key, so the provider routes them to the same
+    cache and every analyzer after the first reads the shared prefix from it at
+    the discounted cached-token rate. The key is derived from the document
+    content rather than the doc_id, keeping it stable across runs.
+
+    Args:
+        doc_id: Key of the document in the document store
+
+    Returns:
+        str: The prompt_cache_key for requests about the document
+    """
+    derived = get_derived_values(doc_id)
+    if "prompt_cache_key" not in derived:
+        derived["prompt_cache_key"] = hashlib.blake2b(
+            get_document(doc_id).encode(), digest_size=16
+        ).hexdigest()
+
+    return derived["prompt_cache_key"]
+
+
+def prompt_cache_kwargs(cache_key):
+    """
+    Return the provider prompt caching options for an LLM request.
+
+    Args:
+        cache_key: Prompt cache key from document_cache_key, or None
+
+    Returns:
+        dict: Keyword arguments for the chat model call; empty without a key
+    """
+    return {"prompt_cache_key": cache_key} if cache_key else {}
+
+
+@per_event_loop
+def get_embeddings():
+    """
+    Return the embedding client shared by document chunking and retrieval.
+
+    Returns:
+        OpenAIEmbeddings: Client for the configured embedding model
+    """
+    return OpenAIEmbeddings(
+        model=LLMConfig.EMBEDDING_MODEL,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+    )
+
+
+async def aprepare_chunks(document_text):
+    """
+    Split a document into chunks and embed them in a single batch.
+
+    Documents that fit entirely within the retrieval budget are not embedded,
+    since every analyzer would receive all of their chunks anyway.
+
+    Args:
+        document_text: Complete text content of the legal document
+
+    Returns:
+        tuple: List of chunk strings and the list of their embeddings
+    """
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=LLMConfig.CHUNK_SIZE, chunk_overlap=LLMConfig.CHUNK_OVERLAP
+    )
+    chunks = splitter.split_text(document_text)
+
+    if len(chunks) <= LLMConfig.RETRIEVAL_TOP_K:
+        return chunks, []
+
+    embeddings = await get_embeddings().aembed_documents(chunks)
+
+    return chunks, embeddings
+
+
+# Seed queries are static, so each one is embedded once per process
+_QUERY_EMBEDDINGS = {}
+
+
+def with_document(state):
+    """
+    Return the template values of a node with the document text filled in.
+
+    The workflow state carries only the doc_id, so nodes that send the complete
+    document look its text up in the document store when building the prompt.
+
+    Args:
+        state: Workflow state containing the doc_id
+
+    Returns:
+        dict: The state values together with the document text
+    """
+    return {**state, "document_text": get_document(state["doc_id"])}
+
+
+async def aretrieve_relevant_text(state, query, k=LLMConfig.RETRIEVAL_TOP_K):
+    """
+    Select the document chunks most relevant to an analysis seed query.
+
+    Args:
+        state: Workflow state containing the doc_id of the prepared document
+        query: Seed query describing the concern of the analysis, or a tuple of
+            queries whose top-k chunks are merged
+        k: Number of chunks to retrieve per query
+
+    Returns:
+        str: The selected chunks in document order, or the full text when the
+        document was not embedded
+    """
+    chunks, embeddings = get_chunks(state["doc_id"])
+    if embeddings is None:
+        return get_document(state["doc_id"])
+
+    top_indices = set()
+    for seed in (query,) if isinstance(query, str) else query:
+        if seed not in _QUERY_EMBEDDINGS:
+            _QUERY_EMBEDDINGS[seed] = np.asarray(
+                await get_embeddings().aembed_query(seed)
+            )
+
+        # OpenAI embeddings are unit length, so the dot product is the cosine similarity
+        similarities = embeddings @ _QUERY_EMBEDDINGS[seed]
+        top_indices.update(np.argsort(similarities)[-k:].tolist())
+
+    top_indices = sorted(top_indices)
+
+    return "\n\n[...]\n\n".join(chunks[i] for i in top_indices)
 
 
-def call_llm_with_template(
+@njit(cache=True)
+def weighted_score(weights: np.ndarray, signals: np.ndarray) -> float:
+    """
+    Combine per-dimension signals in [0, 1] into a weighted 0-100 score.
+
+    Args:
+        weights: Relative weight of each dimension
+        signals: Strength of each dimension, saturated to at most 1
+
+    Returns:
+        float: The weighted score on a 0-100 scale
+    """
+    total = 0.0
+    weight_sum = 0.0
+    for i in range(weights.shape[0]):
+        total += weights[i] * min(signals[i], 1.0)
+        weight_sum += weights[i]
+
+    if weight_sum == 0.0:
+        return 0.0
+    return 100.0 * total / weight_sum
+
+
+@per_event_loop
+def _request_limiter():
+    """
+    Return the semaphore bounding in-flight LLM requests on the running loop.
+
+    Returns:
+        asyncio.Semaphore: Limiter shared by every request on the current loop
+    """
+    return asyncio.Semaphore(LLMConfig.MAX_CONCURRENT_REQUESTS)
+
+
+async def call_llm_with_template(
     template_values,
     template,
     model=LLMConfig.DEFAULT_MODEL,
     temperature=LLMConfig.DEFAULT_TEMPERATURE,
+    cache_key=None,
 ):
     """
     Execute an LLM call with standardized template processing.
 
     This function handles the complete process of formatting a prompt template
     with state values, executing the LLM call, and extracting the response content.
+    The prompt is sent as a message sequence built by build_prompt_messages.
+    Awaiting the request lets parallel workflow branches share one event loop
+    while they wait on the network, instead of each occupying a worker thread.
 
     Args:
         template_values: Dictionary of values to populate the template
         template: PromptTemplate object from the prompts module
         model: LLM model identifier (defaults to configuration default)
         temperature: Sampling temperature for response generation
+        cache_key: Optional provider prompt cache key, see document_cache_key
 
     Returns:
         str: The processed content from the LLM response
     """
-    llm = ChatOpenAI(model=model, temperature=temperature)
+    llm = get_llm(model, temperature)
 
-    # Format the prompt template with appropriate values
-    prompt = template.format(**template_values)
+    # Build the cache-friendly message sequence from the template values
+    prompt = build_prompt_messages(template_values, template)
 
-    res = llm.invoke(prompt)
+    async with _request_limiter():
+        res = await llm.ainvoke(prompt, **prompt_cache_kwargs(cache_key))
 
     return res.content
 
 
-def call_structured_llm(
+async def call_structured_llm(
     template_values,
     prompt_template,
     output_class,
     model=LLMConfig.DEFAULT_MODEL,
     temperature=LLMConfig.DEFAULT_TEMPERATURE,
+    cache_key=None,
 ):
     """
     Execute an LLM call with structured output validation.
 
     This function enables type-safe interaction with language models by
-    enforcing a schema on the response through Pydantic model validation.
+    constraining the response to the JSON schema of output_class.
 
     Args:
         template_values: Dictionary of values to populate the template
-        prompt_template: String template for the prompt
-        output_class: Pydantic model class defining the expected response structure
+        prompt_template: PromptTemplate object from the prompts module
+        output_class: TypedDict class defining the expected response structure
         model: LLM model identifier (defaults to configuration default)
         temperature: Sampling temperature for response generation
+        cache_key: Optional provider prompt cache key, see document_cache_key
 
     Returns:
-        An instance of output_class with the structured LLM response
+        dict: The structured LLM response, shaped like output_class
     """
-    structured_llm = ChatOpenAI(
-        model=model, temperature=temperature
-    ).with_structured_output(output_class)
+    structured_llm = get_structured_llm(model, temperature, output_class)
 
-    # Format the prompt template with appropriate values
-    prompt = prompt_template.format(**template_values)
+    # Build the cache-friendly message sequence from the template values
+    prompt = build_prompt_messages(template_values, prompt_template)
 
-    return structured_llm.invoke(prompt)
+    async with _request_limiter():
+        return await structured_llm.ainvoke(prompt, **prompt_cache_kwargs(cache_key))
 
 
-def create_analysis_function(template, result_key):
+async def stream_llm_with_template(
+    template_values,
+    template,
+    model=LLMConfig.DEFAULT_MODEL,
+    temperature=LLMConfig.DEFAULT_TEMPERATURE,
+    cache_key=None,
+):
+    """
+    Streaming counterpart of call_llm_with_template.
+
+    Yields the response as it is generated, so long outputs can be shown to the
+    user before the model has finished writing them.
+
+    Args:
+        template_values: Dictionary of values to populate the template
+        template: PromptTemplate object from the prompts module
+        model: LLM model identifier (defaults to configuration default)
+        temperature: Sampling temperature for response generation
+        cache_key: Optional provider prompt cache key, see document_cache_key
+
+    Yields:
+        str: Successive pieces of the LLM response content
+    """
+    llm = get_llm(model, temperature)
+
+    # Build the cache-friendly message sequence from the template values
+    prompt = build_prompt_messages(template_values, template)
+
+    # The slot is held until the stream completes, as the request is in flight
+    async with _request_limiter():
+        async for chunk in llm.astream(prompt, **prompt_cache_kwargs(cache_key)):
+            yield chunk.content
+
+
+# Analyses a document type has no subject matter for, keyed by the lowercased
+# document type. Their nodes still run, so the score joins complete, but they
+# return a placeholder without calling the LLM.
+INAPPLICABLE_ANALYSES = {
+    "nda": frozenset(
+        {
+            "delivery_timelines",
+            "performance_criteria",
+            "pricing_leverage_points",
+            "service_scope_expansion",
+        }
+    ),
+    "letter of intent": frozenset({"warranty_gaps", "force_majeure_implications"}),
+}
+
+NOT_APPLICABLE = "Not applicable to this document type"
+
+
+def create_analysis_function(
+    template,
+    result_key,
+    query=None,
+    output_class=None,
+    model=LLMConfig.EXTRACTION_MODEL,
+):
     """
     Factory function that creates standardized document analysis processors.
 
     This higher-order function generates specialized analysis functions with
     consistent error handling, state management, and output formatting. It
     enables consistent behavior across multiple analysis nodes while reducing
-    code duplication.
+    code duplication. Analyses run on the inexpensive extraction model unless a
+    node overrides it, and are skipped without an LLM call when the document
+    type is listed in INAPPLICABLE_ANALYSES for them; structured analyses
+    covering several fields report the inapplicable ones as NOT_APPLICABLE.
+    When the semantic cache is enabled, documents nearly identical to one
+    already analyzed reuse its result instead of calling the LLM, and merely
+    similar documents have the cached result adapted to them rather than
+    analyzed from scratch.
 
     Args:
         template: PromptTemplate for the specific analysis task
-        result_key: State dictionary key for storing the analysis result
+        result_key: State dictionary key for storing the analysis result; for
+            structured analyses, the name of the analysis in the semantic cache
+        query: Optional retrieval seed query, or tuple of queries; when given, the
+            prompt receives only the most relevant document chunks instead of the
+            full document text
+        output_class: Optional TypedDict schema; when given, the analysis is one
+            structured call and each of its fields is stored under its own key
+        model: LLM model identifier (defaults to the extraction model)
 
     Returns:
-        function: A state processor function compatible with LangGraph nodes
+        function: An async state processor function compatible with LangGraph nodes
     """
 
-    def analyze_function(state):
-        result = call_llm_with_template(state, template)
-        return {result_key: result}
+    async def run(template_values, prompt_template, cache_key):
+        # Responses are kept as text, so structured ones are cached as JSON
+        if output_class is None:
+            return await call_llm_with_template(
+                template_values, prompt_template, model=model, cache_key=cache_key
+            )
+
+        res = await call_structured_llm(
+            template_values,
+            prompt_template,
+            output_class,
+            model=model,
+            cache_key=cache_key,
+        )
+        return json.dumps(res)
+
+    def to_update(result, inapplicable):
+        if output_class is None:
+            return {result_key: result}
+
+        # Fused analyses report the fields their document type cannot contain
+        # the same way as the individual analyzers that skip them
+        update = json.loads(result)
+        for key in inapplicable.intersection(update):
+            update[key] = NOT_APPLICABLE
+
+        return update
+
+    async def analyze_function(state):
+        document_type = state["document_type"].strip().lower()
+        inapplicable = INAPPLICABLE_ANALYSES.get(document_type, frozenset())
+        if result_key in inapplicable:
+            return {result_key: NOT_APPLICABLE}
+
+        document_text = get_document(state["doc_id"])
+        semantic_cache = get_semantic_cache()
+        # Keep one index per analysis and document type so hits never cross tasks
+        namespace = f"{result_key}:{state['document_type']}"
+
+        if semantic_cache:
+            cached = await semantic_cache.alookup(namespace, document_text)
+            if cached is not None:
+                return to_update(cached, inapplicable)
+
+        template_values = {
+            **state,
+            "document_text": (
+                await aretrieve_relevant_text(state, query) if query else document_text
+            ),
+        }
+
+        pattern = None
+        if semantic_cache:
+            pattern = await semantic_cache.alookup(
+                namespace, document_text, threshold=LLMConfig.SEMANTIC_PATTERN_THRESHOLD
+            )
+
+        # Analyzers sending excerpts still share the key of the whole document
+        cache_key = document_cache_key(state["doc_id"])
+        if pattern is not None:
+            result = await run(
+                {**template_values, "reference_analysis": pattern},
+                PATTERN_ADAPTATION_TEMPLATE,
+                cache_key,
+            )
+        else:
+            result = await run(template_values, template, cache_key)
+
+        if semantic_cache:
+            await semantic_cache.aupdate(namespace, document_text, result)
+
+        return to_update(result, inapplicable)
 
     return analyze_function
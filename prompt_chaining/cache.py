@@ -0,0 +1,218 @@
+"""
+LLM Response Cache
+
+This module caches the LLM responses of the Product Description Generator.
+Regenerating content for a product that was already processed repeats the same
+prompts, so identical prompts are answered from an in-process cache keyed by a
+SHA-256 of the prompt, and concurrent identical prompts share a single request.
+With SEMANTIC_CACHE=1, text prompts are additionally matched by the embedding
+similarity of their product data, among prompts sharing a similarity scope such
+as the product name, letting near-duplicate products (e.g. colour variants
+listed under the same name) reuse each other's responses.
+"""
+
+import asyncio
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from prompt_chaining.clients import get_http_client
+from shared.event_loop import per_event_loop
+
+# Seconds a cached response stays valid
+CACHE_TTL = 3600
+# Upper bound on cached responses; the least recently used are evicted
+CACHE_MAX_ENTRIES = 1024
+
+# Opt-in embedding lookup for prompts that are similar but not identical
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE", "0") == "1"
+# Minimum cosine similarity for a semantic cache hit
+SEMANTIC_THRESHOLD = 0.95
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+_RESPONSES = OrderedDict()  # key -> (expiry time, content, semantic index or None)
+_VECTORS = {}  # semantic index -> {key: normalized product data embedding}
+_STRUCTURED = {}  # namespace -> (client, client bound to the output schema)
+_INFLIGHT = {}  # key -> task generating the response on a cache miss
+
+
+@per_event_loop
+def get_embeddings():
+    """
+    Return the embedding client used for semantic lookups.
+    """
+    return OpenAIEmbeddings(model=EMBEDDING_MODEL, http_async_client=get_http_client())
+
+
+def _prompt_text(prompt):
+    """
+    Serialize a prompt string or message list into the text used as cache key.
+    """
+    if isinstance(prompt, str):
+        return prompt
+
+    return "\n".join(
+        m.content if isinstance(m.content, str) else json.dumps(m.content)
+        for m in prompt
+    )
+
+
+def _similarity_text(prompt):
+    """
+    Return the part of a prompt compared by embedding.
+
+    The leading instructions are identical for every product and would inflate
+    the similarity of unrelated ones, so only the final message, carrying the
+    product data, is embedded.
+    """
+    return prompt if isinstance(prompt, str) else prompt[-1].content
+
+
+def _is_text_only(prompt):
+    """
+    Check whether a prompt can be compared by embedding.
+
+    Multimodal prompts differ mostly in their image, which the embedding of their
+    text would not capture, so they are only ever matched exactly.
+    """
+    return isinstance(prompt, str) or all(isinstance(m.content, str) for m in prompt)
+
+
+def _lookup(key):
+    """
+    Return the cached content for a key, or None when missing or expired.
+    """
+    entry = _RESPONSES.get(key)
+    if entry is None:
+        return None
+
+    expires, content, _ = entry
+    if expires < time.monotonic():
+        _evict(key)
+        return None
+
+    _RESPONSES.move_to_end(key)
+    return content
+
+
+def _store(key, content, index, ttl):
+    """
+    Cache content under a key, evicting the least recently used entry if full.
+    """
+    _RESPONSES[key] = (time.monotonic() + ttl, content, index)
+    _RESPONSES.move_to_end(key)
+
+    if len(_RESPONSES) > CACHE_MAX_ENTRIES:
+        _evict(next(iter(_RESPONSES)))
+
+
+def _evict(key):
+    """
+    Drop a cached response together with its embedding.
+    """
+    _, _, index = _RESPONSES.pop(key)
+    _VECTORS.get(index, {}).pop(key, None)
+
+
+async def _find_similar(index_name, text):
+    """
+    Find the cached prompt most similar to text within a semantic index.
+
+    Returns:
+        tuple: The embedding of text and the key of the best match, or None in
+        place of the key when no cached prompt reaches SEMANTIC_THRESHOLD
+    """
+    vector = np.asarray(await get_embeddings().aembed_query(text))
+    vector /= np.linalg.norm(vector) or 1.0
+
+    index = _VECTORS.get(index_name)
+    if not index:
+        return vector, None
+
+    keys = list(index)
+    similarities = np.stack([index[k] for k in keys]) @ vector
+    best = int(np.argmax(similarities))
+
+    return vector, keys[best] if similarities[best] >= SEMANTIC_THRESHOLD else None
+
+
+async def cached_invoke(
+    llm, prompt, ttl=CACHE_TTL, output_class=None, similarity_scope=None
+):
+    """
+    Invoke a chat model, reusing the response to an identical or similar prompt.
+
+    Args:
+        llm: Chat model client to call on a cache miss
+        prompt: Prompt string or list of messages
+        ttl: Seconds the response stays valid in the cache
+        output_class: Optional TypedDict schema the response is constrained to
+        similarity_scope: Value a semantic hit must share with the prompt, e.g.
+            the product name; prompts without one are only matched exactly
+
+    Returns:
+        str | dict: The content of the (possibly cached) response, or the parsed
+        structured response when output_class is given
+    """
+    # Responses are only shared between clients with the same configuration
+    namespace = f"{llm.model_name}:{llm.temperature}"
+    if output_class is not None:
+        namespace += f":{output_class.__name__}"
+    text = _prompt_text(prompt)
+    key = hashlib.sha256(f"{namespace}\n{text}".encode()).hexdigest()
+
+    content = _lookup(key)
+    if content is not None:
+        return content
+
+    # Concurrent callers with the same prompt share one in-flight request
+    if key not in _INFLIGHT:
+        task = asyncio.ensure_future(
+            _generate(llm, prompt, key, namespace, ttl, output_class, similarity_scope)
+        )
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+        _INFLIGHT[key] = task
+
+    # Shielded so a cancelled caller does not cancel the request of the others
+    return await asyncio.shield(_INFLIGHT[key])
+
+
+async def _generate(llm, prompt, key, namespace, ttl, output_class, similarity_scope):
+    """
+    Answer a prompt missing from the exact cache and store the response.
+
+    Returns:
+        str | dict: The response of a similar cached prompt, or a new response
+    """
+    index = None
+    if SEMANTIC_CACHE_ENABLED and similarity_scope and _is_text_only(prompt):
+        # Hits are only looked up among prompts of the same scope, so a similar
+        # but different product never receives another product's content
+        index = f"{namespace}\n{similarity_scope}"
+        vector, similar_key = await _find_similar(index, _similarity_text(prompt))
+        content = _lookup(similar_key) if similar_key else None
+        if content is not None:
+            return content
+
+    if output_class is None:
+        content = (await llm.ainvoke(prompt)).content
+    else:
+        # Rebound when the client changes, as each event loop has its own client
+        bound = _STRUCTURED.get(namespace)
+        if bound is None or bound[0] is not llm:
+            bound = _STRUCTURED[namespace] = (
+                llm,
+                llm.with_structured_output(output_class),
+            )
+        content = await bound[1].ainvoke(prompt)
+
+    _store(key, content, index, ttl)
+    if index is not None:
+        _VECTORS.setdefault(index, {})[key] = vector
+
+    return content
@@ -0,0 +1,23 @@
+"""
+HTTP Client
+
+This module provides the pooled async HTTP client of the Product Description
+Generator. The chat model and embedding clients, as well as the product image
+downloads, all send their requests through it, so they reuse keep-alive
+connections instead of each opening their own.
+"""
+
+import httpx
+
+from shared.event_loop import per_event_loop
+
+
+@per_event_loop
+def get_http_client():
+    """
+    Return the pooled async HTTP client of the running event loop.
+
+    The client is closed by the workflow entry points once the last of them
+    running on the loop has finished.
+    """
+    return httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
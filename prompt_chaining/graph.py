@@ -6,7 +6,18 @@ various marketing content including product descriptions, SEO titles, and keywor
 
 The workflow demonstrates prompt chaining - a simple but powerful technique
 where multiple LLM calls are chained together, with each step building on the results
-of previous steps.
+of previous steps. Steps that do not depend on each other run in parallel.
+
+The generation nodes are coroutines, so the workflow is run asynchronously:
+
+    asyncio.run(generate_product_content("P001"))
+
+The entry points close the pooled HTTP client of the event loop once the last of
+them running on it has finished; invoking the compiled workflow directly leaves
+that to the caller. generate_product_content_batch processes a whole catalog
+concurrently, and
+generate_product_content_stream yields the state while the descriptions are
+still being written, for callers that display them as they arrive.
 """
 
 import sys
@@ -14,16 +25,14 @@ import os
 import argparse
 
 from langgraph.graph import StateGraph, END, START
+from shared.event_loop import event_loop_scope
 from prompt_chaining.state import ProductDescriptionGeneratorState
 from prompt_chaining.nodes import (
     find_product_details,
-    gate_product_found,
     extract_product_features_from_image,
     generate_product_description,
     generate_product_short_description,
-    generate_product_seo_title,
-    generate_product_seo_description,
-    generate_product_keywords,
+    generate_product_seo_content,
 )
 
 # Create a state graph with our state type
@@ -36,23 +45,106 @@ graph.add_node(
 )
 graph.add_node("generate_product_description", generate_product_description)
 graph.add_node("generate_product_short_description", generate_product_short_description)
-graph.add_node("generate_product_seo_title", generate_product_seo_title)
-graph.add_node("generate_product_seo_description", generate_product_seo_description)
-graph.add_node("generate_product_keywords", generate_product_keywords)
+graph.add_node("generate_product_seo_content", generate_product_seo_content)
 
 # Define the workflow by connecting the nodes
 graph.add_edge(START, "find_product_details")
-graph.add_conditional_edges(
-    "find_product_details",
-    gate_product_found,
-    {"END": END, "analyze_product_image": "extract_product_features_from_image"},
-)
+# find_product_details routes itself: to the image analysis, straight to the
+# description when the image is skipped, or to END when the product does not exist
 graph.add_edge("extract_product_features_from_image", "generate_product_description")
-graph.add_edge("generate_product_description", "generate_product_short_description")
-graph.add_edge("generate_product_short_description", "generate_product_seo_title")
-graph.add_edge("generate_product_seo_title", "generate_product_seo_description")
-graph.add_edge("generate_product_seo_description", "generate_product_keywords")
-graph.add_edge("generate_product_keywords", END)
+
+# The short description and SEO content nodes only read the product name and the
+# main description, so they run in parallel once it is written
+for content_node in (
+    "generate_product_short_description",
+    "generate_product_seo_content",
+):
+    graph.add_edge("generate_product_description", content_node)
+    graph.add_edge(content_node, END)
 
 # Compile the graph into a runnable
 workflow = graph.compile()
+
+
+async def generate_product_content(product_id):
+    """
+    Run the workflow for a single product.
+
+    Args:
+        product_id: The id of the product
+
+    Returns:
+        dict: The final workflow state with the generated content
+    """
+    async with event_loop_scope():
+        return await workflow.ainvoke({"product_id": product_id})
+
+
+# Upper bound on products processed at once by a batch run, sized to stay under
+# the provider's rate limits
+BATCH_MAX_CONCURRENCY = 32
+
+
+async def generate_product_content_batch(product_ids):
+    """
+    Run the workflow for many products concurrently.
+
+    The runs share one event loop and the pooled HTTP client of the nodes, and
+    at most BATCH_MAX_CONCURRENCY of them are in flight at a time. A failing run
+    does not abort the batch; its exception is returned in place of its state.
+
+    Args:
+        product_ids: The ids of the products
+
+    Returns:
+        list: The final state of each run, in the order of product_ids
+    """
+    async with event_loop_scope():
+        return await workflow.abatch(
+            [{"product_id": product_id} for product_id in product_ids],
+            config={"max_concurrency": BATCH_MAX_CONCURRENCY},
+            return_exceptions=True,
+        )
+
+
+# Text nodes whose output is shown to the user, and the state key each one writes
+STREAMED_NODES = {
+    "generate_product_description": "product_description",
+    "generate_product_short_description": "product_short_description",
+}
+
+
+async def generate_product_content_stream(product_id):
+    """
+    Run the workflow, yielding the state as the content is being written.
+
+    A new state is yielded after every completed step and for each token of the
+    streamed text nodes, so the descriptions can be displayed while they are
+    still being generated. LangGraph streams the tokens of the nodes' model calls
+    without any change to the nodes themselves.
+
+    Args:
+        product_id: The id of the product
+
+    Yields:
+        dict: The latest workflow state; the last one is the final state
+    """
+    state = {"product_id": product_id}
+    drafts = {}
+
+    async with event_loop_scope():
+        async for mode, payload in workflow.astream(
+            state, stream_mode=["values", "messages"]
+        ):
+            if mode == "values":
+                state, drafts = payload, {}
+                yield state
+                continue
+
+            chunk, metadata = payload
+            key = STREAMED_NODES.get(metadata.get("langgraph_node"))
+            if key is None or not chunk.content:
+                continue
+
+            drafts[key] = drafts.get(key, "") + chunk.content
+            yield {**state, **drafts}
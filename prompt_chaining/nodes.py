@@ -1,227 +1,244 @@
 from prompt_chaining.state import ProductDescriptionGeneratorState
+from prompt_chaining.cache import cached_invoke
+from prompt_chaining.clients import get_http_client
+from prompt_chaining.prompts import (
+    PRODUCT_IMAGE_INSTRUCTIONS,
+    PRODUCT_DESCRIPTION_INSTRUCTIONS,
+    SHORT_DESCRIPTION_INSTRUCTIONS,
+    SEO_CONTENT_INSTRUCTIONS,
+    PRODUCT_DESCRIPTION_INPUT,
+    PRODUCT_SUMMARY_INPUT,
+)
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
+from shared.event_loop import per_event_loop
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import END
+from langgraph.types import Command
+from collections import OrderedDict
+from functools import cache
+from typing import Annotated, List, Literal, TypedDict
+import base64
+import httpx
 import json
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib parser is used instead
+    orjson = None
 
-def find_product_details(state: ProductDescriptionGeneratorState):
+# Long-form and image analysis steps use the stronger model; the short-format
+# listing and SEO content are well within the reach of the smallest one
+IMAGE_ANALYSIS_MODEL = "gpt-4.1-mini"
+DESCRIPTION_MODEL = "gpt-4.1-mini"
+SHORT_FORMAT_MODEL = "gpt-4.1-nano"
+
+# Upper bound on downloaded product images kept in memory
+IMAGE_CACHE_MAX_ENTRIES = 32
+
+# Categories whose listed features already cover everything a picture would show,
+# so their products skip the image analysis call
+_SKIP_IMAGE_CATEGORIES = frozenset({"Digital Goods", "Software", "Services"})
+
+# Mock product database, resolved once relative to this module
+MOCK_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "mock_data", "mock_data.json"
+)
+
+
+# System messages are built once, as the instructions never change between calls
+PRODUCT_IMAGE_MESSAGE = SystemMessage(content=PRODUCT_IMAGE_INSTRUCTIONS)
+PRODUCT_DESCRIPTION_MESSAGE = SystemMessage(content=PRODUCT_DESCRIPTION_INSTRUCTIONS)
+SHORT_DESCRIPTION_MESSAGE = SystemMessage(content=SHORT_DESCRIPTION_INSTRUCTIONS)
+SEO_CONTENT_MESSAGE = SystemMessage(content=SEO_CONTENT_INSTRUCTIONS)
+
+
+@per_event_loop
+def get_llm(model, temperature, scope):
     """
-    Find details about the product using the product ID.
+    Return the shared chat model client for a model, temperature and node.
+
+    Every client of an event loop sends requests through its pooled async HTTP
+    client, so the parallel content nodes reuse keep-alive connections to the
+    provider instead of repeating the TCP and TLS handshakes. Requests carry
+    only static headers, naming the node in x-prompt-scope, so an exact-match
+    caching gateway set as OPENAI_BASE_URL sees identical payloads for identical
+    prompts.
     """
-    # Load mock data
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    mock_data_path = os.path.join(current_dir, ".", "mock_data", "mock_data.json")
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        default_headers={"x-prompt-scope": scope},
+        http_async_client=get_http_client(),
+    )
 
-    with open(mock_data_path, "r") as file:
-        products = json.load(file)
 
-    # Find product by ID
-    product = next(
-        (p for p in products if p["product_id"] == state["product_id"]), None
-    )
+@cache
+def load_products():
+    """
+    Load the mock product database once, indexed by product ID.
+    """
+    with open(MOCK_DATA_PATH, "rb") as file:
+        data = file.read()
+
+    # orjson parses the catalog several times faster than the json module
+    products = orjson.loads(data) if orjson else json.loads(data)
 
-    if product:
-        return {
-            "product_name": product["product_name"],
-            "product_image_url": product["product_image_url"],
-            "product_features": product["product_features"],
-            "product_category": product["product_category"],
-            "product_specifications": product["product_specifications"],
-        }
-    else:
-        return {}
+    return {p["product_id"]: p for p in products}
 
 
-def gate_product_found(state: ProductDescriptionGeneratorState):
+def find_product_details(
+    state: ProductDescriptionGeneratorState,
+) -> Command[
+    Literal[
+        "extract_product_features_from_image", "generate_product_description", "__end__"
+    ]
+]:
     """
-    Gate the product details to ensure they are valid.
+    Find details about the product using the product ID.
+
+    Routes straight to the end of the workflow when the product does not exist,
+    so no separate gate step is needed. Products without an image, or in a
+    category listed in _SKIP_IMAGE_CATEGORIES, go directly to the description.
     """
-    if state["product_name"] is None:
+    # Find product by ID
+    product = load_products().get(state["product_id"])
+
+    if product is None:
         print("Product not found")
-        return "END"
-    else:
-        return "analyze_product_image"
+        return Command(goto=END)
 
+    update = {
+        "product_name": product["product_name"],
+        "product_image_url": product.get("product_image_url"),
+        "product_features": product["product_features"],
+        "product_category": product["product_category"],
+        "product_specifications": product["product_specifications"],
+    }
 
-def extract_product_features_from_image(state: ProductDescriptionGeneratorState):
+    category = update["product_category"]
+    if update["product_image_url"] and category not in _SKIP_IMAGE_CATEGORIES:
+        return Command(update=update, goto="extract_product_features_from_image")
 
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0)
+    # The description prompt still expects the visual features
+    update["product_features_from_image"] = ""
+    return Command(update=update, goto="generate_product_description")
 
-    res = llm.invoke(
+
+_IMAGE_DATA_URLS = OrderedDict()  # image URL -> base64 data URL
+
+
+async def load_image_data_url(url):
+    """
+    Download a product image once and return it as a base64 data URL.
+
+    Sending the image inline spares the provider from fetching it from the
+    product's CDN on every call. When the download fails the original URL is
+    returned, leaving the fetch to the provider.
+    """
+    if url in _IMAGE_DATA_URLS:
+        _IMAGE_DATA_URLS.move_to_end(url)
+        return _IMAGE_DATA_URLS[url]
+
+    try:
+        res = await get_http_client().get(url, follow_redirects=True)
+        res.raise_for_status()
+    except httpx.HTTPError:
+        return url
+
+    content_type = res.headers.get("content-type", "image/jpeg").split(";")[0]
+    encoded = base64.b64encode(res.content).decode()
+    _IMAGE_DATA_URLS[url] = f"data:{content_type};base64,{encoded}"
+    if len(_IMAGE_DATA_URLS) > IMAGE_CACHE_MAX_ENTRIES:
+        _IMAGE_DATA_URLS.popitem(last=False)
+
+    return _IMAGE_DATA_URLS[url]
+
+
+async def extract_product_features_from_image(state: ProductDescriptionGeneratorState):
+
+    llm = get_llm(IMAGE_ANALYSIS_MODEL, 0, "extract_product_features_from_image")
+    image_url = await load_image_data_url(state["product_image_url"])
+
+    content = await cached_invoke(
+        llm,
         [
+            PRODUCT_IMAGE_MESSAGE,
             HumanMessage(
                 content=[
-                    {
-                        "type": "text",
-                        "text": f"""
-                            Analyze the product image and extract key visual features.
-                            Return a concise, bullet-point list of observable product attributes and characteristics.
-                            Focus on physical appearance, visible features, and distinguishing elements.
-                            Ensure the extracted information is factual and directly observable in the image.
-                            """,
-                    },
                     {
                         "type": "image_url",
-                        "image_url": {"url": state["product_image_url"]},
+                        "image_url": {"url": image_url},
                     },
                 ]
-            )
-        ]
+            ),
+        ],
     )
 
-    return {"product_features_from_image": res.content}
+    return {"product_features_from_image": content}
 
 
-def generate_product_description(state: ProductDescriptionGeneratorState):
+async def generate_product_description(state: ProductDescriptionGeneratorState):
     """
     Generate a description for the product.
     """
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.3)
+    llm = get_llm(DESCRIPTION_MODEL, 0.3, "generate_product_description")
 
-    prompt = f"""
-    PRODUCT INFORMATION:
-    Name: {state["product_name"]}
-    Features: {state["product_features"]}
-    Category: {state["product_category"]}
-    Specifications: {state["product_specifications"]}
-    Visual Features: {state["product_features_from_image"]}
-    
-    TASK:
-    Create a comprehensive product description that effectively communicates value to potential customers.
-    
-    REQUIREMENTS:
-    - Length: 100-150 words
-    - Tone: Professional and informative
-    - Structure: Introduction, key features, benefits, conclusion
-    - SEO: Incorporate relevant keywords naturally
-    - Include important technical specifications where relevant
-    - Highlight unique selling points and competitive advantages
-    
-    PRODUCT DESCRIPTION:
-    """
+    prompt = [
+        PRODUCT_DESCRIPTION_MESSAGE,
+        HumanMessage(content=PRODUCT_DESCRIPTION_INPUT.format_map(state)),
+    ]
 
-    res = llm.invoke(prompt)
+    content = await cached_invoke(llm, prompt, similarity_scope=state["product_name"])
 
-    return {"product_description": res.content}
+    return {"product_description": content}
 
 
-def generate_product_short_description(state: ProductDescriptionGeneratorState):
+async def generate_product_short_description(state: ProductDescriptionGeneratorState):
     """
     Generate a short description for the product.
     """
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0)
-
-    prompt = f"""
-    PRODUCT INFORMATION:
-    Name: {state["product_name"]}
-    Full Description: {state["product_description"]}
-    
-    TASK:
-    Create a concise product summary for use in listings, search results, and catalog entries.
-    
-    REQUIREMENTS:
-    - Length: 15-25 words
-    - Tone: Compelling and informative
-    - Must capture the product's core value proposition
-    - Include primary keywords without keyword stuffing
-    - Suitable for display in search results and product cards
-    
-    SHORT DESCRIPTION:
-    """
+    llm = get_llm(SHORT_FORMAT_MODEL, 0, "generate_product_short_description")
 
-    res = llm.invoke(prompt)
+    prompt = [
+        SHORT_DESCRIPTION_MESSAGE,
+        HumanMessage(content=PRODUCT_SUMMARY_INPUT.format_map(state)),
+    ]
 
-    return {"product_short_description": res.content}
+    content = await cached_invoke(llm, prompt, similarity_scope=state["product_name"])
 
+    return {"product_short_description": content}
 
-def generate_product_seo_title(state: ProductDescriptionGeneratorState):
-    """
-    Generate a SEO title for the product.
-    """
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0)
-
-    prompt = f"""
-    PRODUCT INFORMATION:
-    Name: {state["product_name"]}
-    Description: {state["product_description"]}
-    
-    TASK:
-    Create an SEO-optimized title for the product page.
-    
-    REQUIREMENTS:
-    - Length: 50-60 characters maximum
-    - Must include the product name
-    - Include a primary keyword near the beginning
-    - Communicate unique selling point if possible
-    - Avoid keyword stuffing or unnatural phrasing
-    - Compelling for users but optimized for search engines
-    
-    SEO TITLE:
-    """
-
-    res = llm.invoke(prompt)
-
-    return {"product_seo_title": res.content}
 
-
-def generate_product_seo_description(state: ProductDescriptionGeneratorState):
-    """
-    Generate a SEO description for the product.
+class SEOContent(TypedDict):
     """
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0)
-
-    prompt = f"""
-    PRODUCT INFORMATION:
-    Name: {state["product_name"]}
-    Description: {state["product_description"]}
-    
-    TASK:
-    Create an SEO-optimized meta description for the product page.
-    
-    REQUIREMENTS:
-    - Length: 150-160 characters maximum
-    - Include the primary keyword and at least one secondary keyword
-    - Communicate unique value proposition
-    - Include a clear call-to-action
-    - Must be compelling for users to click through from search results
-    - Avoid truncation in search results by staying within character limits
-    
-    SEO META DESCRIPTION:
+    Structured output model for the SEO content of a product page.
     """
 
-    res = llm.invoke(prompt)
+    seo_title: Annotated[str, ..., "SEO optimized title for the product page"]
+    seo_description: Annotated[str, ..., "SEO optimized meta description"]
+    keywords: Annotated[
+        List[str], ..., "SEO keywords: primary, then secondary, then long-tail"
+    ]
 
-    return {"product_seo_description": res.content}
 
-
-def generate_product_keywords(state: ProductDescriptionGeneratorState):
+async def generate_product_seo_content(state: ProductDescriptionGeneratorState):
     """
-    Generate a list of keywords for the product.
+    Generate the SEO title, meta description and keywords for the product.
     """
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0)
+    llm = get_llm(SHORT_FORMAT_MODEL, 0, "generate_product_seo_content")
 
-    prompt = f"""
-    PRODUCT INFORMATION:
-    Name: {state["product_name"]}
-    Description: {state["product_description"]}
-    
-    TASey:
-    Generate a structured list of SEO ywrdywords for the product.
-    
-    REQUIREMENTS:
-    - Include 10-15 relevant keywords and phrases
-    - Categorize by:
-      * Primary keywords (2-3)
-      * Secondary keywords (4-5)
-      * Long-tail keywords (4-7)
-    - Include a mix of commercial and informational intent keywords
-    - Consider search volume and competition (prioritize attainable keywords)
-    - Format the results as a structured list grouped by category
-    
-    KEYWORDS:
-    """
+    prompt = [
+        SEO_CONTENT_MESSAGE,
+        HumanMessage(content=PRODUCT_SUMMARY_INPUT.format_map(state)),
+    ]
 
-    res = llm.invoke(prompt)
+    res = await cached_invoke(
+        llm, prompt, output_class=SEOContent, similarity_scope=state["product_name"]
+    )
 
-    return {"product_keywords": res.content}
+    return {
+        "product_seo_title": res["seo_title"],
+        "product_seo_description": res["seo_description"],
+        "product_keywords": res["keywords"],
+    }
@@ -0,0 +1,47 @@
+"""
+Product Description Generator Prompts
+
+This module contains the static instructions of every step of the Product
+Description Generator workflow. Each step sends its instructions as a system
+message, followed by a user message with the product data. Keeping the
+instructions first and byte-identical across products lets the provider cache
+them, so only the product data is billed at the full input rate. Instructions are
+written as terse constraint lists, since every token of them is sent on each call.
+"""
+
+# Image Analysis Instructions
+PRODUCT_IMAGE_INSTRUCTIONS = """Extract the key visual features of the product image.
+Output: concise bullet list of observable attributes (appearance, visible features, distinguishing elements).
+Only state what is directly visible."""
+
+# Product Description Instructions
+PRODUCT_DESCRIPTION_INSTRUCTIONS = """Write a product description that communicates value to customers.
+Rules:
+1. 100-150 words, professional and informative
+2. Structure: introduction, key features, benefits, conclusion
+3. Use relevant keywords naturally; include key technical specifications
+4. Highlight unique selling points and competitive advantages"""
+
+SHORT_DESCRIPTION_INSTRUCTIONS = """Write a product summary for listings, search results and product cards.
+Rules:
+1. 15-25 words, compelling and informative
+2. Capture the core value proposition
+3. Include primary keywords, no keyword stuffing"""
+
+# SEO Instructions
+# Title, meta description and keywords are generated together in one call, as
+# they are all derived from the same product name and description
+SEO_CONTENT_INSTRUCTIONS = """Write the SEO content for the product page.
+seo_title: max 50-60 characters; include the product name; primary keyword near the start; unique selling point if possible; natural phrasing, no stuffing.
+seo_description: max 150-160 characters; primary and at least one secondary keyword; unique value proposition; clear call-to-action.
+keywords: 10-15 keywords and phrases, ordered primary (2-3), secondary (4-5), long-tail (4-7); mix commercial and informational intent; prefer attainable competition."""
+
+# Product data inputs, rendered with str.format_map(state) for each call
+PRODUCT_DESCRIPTION_INPUT = """Name: {product_name}
+Features: {product_features}
+Category: {product_category}
+Specifications: {product_specifications}
+Visual features: {product_features_from_image}"""
+
+PRODUCT_SUMMARY_INPUT = """Name: {product_name}
+Description: {product_description}"""
@@ -0,0 +1,5 @@
+"""
+Shared Workflow Helpers
+
+Utilities used by more than one of the workflow examples.
+"""
@@ -0,0 +1,82 @@
+"""
+Event Loop Scoped Resources
+
+Pooled async HTTP connections and asyncio primitives are bound to the event loop
+that first uses them, while asyncio.run and the synchronous entry points start a
+fresh loop per call. This module memoizes such resources per running loop, and
+lets the workflow entry points close them once the last entry point running on
+the loop has finished.
+"""
+
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from functools import wraps
+
+_INSTANCES = weakref.WeakKeyDictionary()  # loop -> {(factory, args): instance}
+_OPEN_SCOPES = weakref.WeakKeyDictionary()  # loop -> number of open scopes
+
+
+def per_event_loop(factory):
+    """
+    Memoize a factory separately for each running event loop.
+
+    Args:
+        factory: Function whose result is reused for the same arguments
+
+    Returns:
+        function: The memoized factory, to be called from a running event loop
+    """
+
+    @wraps(factory)
+    def wrapper(*args):
+        loop = asyncio.get_running_loop()
+        # Loops closed outside of a scope can no longer close their resources;
+        # dropping them at least lets their connections be garbage collected
+        for closed in [other for other in _INSTANCES if other.is_closed()]:
+            del _INSTANCES[closed]
+
+        instances = _INSTANCES.setdefault(loop, {})
+        key = (factory, args)
+        if key not in instances:
+            instances[key] = factory(*args)
+
+        return instances[key]
+
+    return wrapper
+
+
+async def aclose_loop_resources():
+    """
+    Close and forget the resources memoized for the running event loop.
+
+    Resources providing an aclose coroutine, such as httpx.AsyncClient, are
+    closed; the rest are only dropped. Later calls build fresh instances.
+    """
+    instances = _INSTANCES.pop(asyncio.get_running_loop(), {})
+
+    for instance in instances.values():
+        if hasattr(type(instance), "aclose"):
+            await instance.aclose()
+
+
+@asynccontextmanager
+async def event_loop_scope():
+    """
+    Scope the resources of the running event loop to an entry point.
+
+    Scopes may be nested or run concurrently on one loop; the resources are
+    closed when the last open scope exits. Long-lived applications can hold a
+    scope open for their whole lifetime to keep the connections warm between
+    calls.
+    """
+    loop = asyncio.get_running_loop()
+    _OPEN_SCOPES[loop] = _OPEN_SCOPES.get(loop, 0) + 1
+
+    try:
+        yield
+    finally:
+        _OPEN_SCOPES[loop] -= 1
+        if not _OPEN_SCOPES[loop]:
+            del _OPEN_SCOPES[loop]
+            await aclose_loop_resources()
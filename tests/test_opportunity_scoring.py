@@ -0,0 +1,64 @@
+"""
+Tests for the list-count signals used by deterministic opportunity scoring.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from parallelization.nodes import opportunities
+from parallelization.nodes.opportunities import (
+    OPPORTUNITY_FIELDS,
+    SIGNAL_SATURATION,
+    _opportunity_signals,
+    calculate_opportunity_score,
+)
+from parallelization.utils import LLMConfig
+
+
+def _items(count, marker="-"):
+    return "\n".join(f"{marker} Opportunity {i}" for i in range(count))
+
+
+def test_signals_count_list_items():
+    state = {
+        "pricing_leverage_points": _items(2),
+        "contract_extension_options": "1. Renewal\n2) Extension\n* Option",
+        "service_scope_expansion": "No list items in this analysis.",
+    }
+
+    np.testing.assert_allclose(
+        _opportunity_signals(state),
+        [2 / SIGNAL_SATURATION, 3 / SIGNAL_SATURATION, 0.0, 0.0],
+    )
+
+
+def test_inline_dashes_are_not_items():
+    state = {"pricing_leverage_points": "A fixed-price, long-term deal - renewable."}
+
+    assert not _opportunity_signals(state).any()
+
+
+def test_deterministic_score_weights_saturated_counts(monkeypatch):
+    monkeypatch.setattr(LLMConfig, "USE_DETERMINISTIC_SCORING", True)
+    state = dict(zip(OPPORTUNITY_FIELDS, (_items(10), _items(0), _items(5), "")))
+
+    result = asyncio.run(calculate_opportunity_score(state))
+
+    expected = 100 * (0.3 + 0.3) / opportunities.OPPORTUNITY_WEIGHTS.sum()
+    assert result == {"opportunity_score": pytest.approx(expected, abs=0.05)}
+
+
+def test_analyses_without_items_fall_back_to_the_llm(monkeypatch):
+    monkeypatch.setattr(LLMConfig, "USE_DETERMINISTIC_SCORING", True)
+
+    async def fake_call(state, template, output_class, **kwargs):
+        return {"score": 42, "explanation": "Assessed by the model"}
+
+    monkeypatch.setattr(opportunities, "call_structured_llm", fake_call)
+    state = dict.fromkeys(OPPORTUNITY_FIELDS, "Nothing favorable was found.")
+
+    assert asyncio.run(calculate_opportunity_score(state)) == {
+        "opportunity_score": 42.0
+    }
@@ -0,0 +1,102 @@
+"""
+Tests for the LLM response cache of the product description workflow.
+"""
+
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from prompt_chaining import cache
+from prompt_chaining.cache import cached_invoke
+
+
+class FakeLLM:
+    """Chat model stand-in counting its calls."""
+
+    model_name = "fake-model"
+    temperature = 0.0
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        call = self.calls
+        # Yield so concurrent callers overlap with the in-flight request
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(content=f"response {call}")
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(cache, "_RESPONSES", OrderedDict())
+    monkeypatch.setattr(cache, "_VECTORS", {})
+    monkeypatch.setattr(cache, "_INFLIGHT", {})
+    monkeypatch.setattr(cache, "SEMANTIC_CACHE_ENABLED", False)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for the monotonic clock used for expiry."""
+    now = SimpleNamespace(value=1000.0)
+    # Replaces the module reference only; the event loop keeps the real clock
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_concurrent_identical_prompts_share_one_request():
+    llm = FakeLLM()
+
+    async def run():
+        return await asyncio.gather(*(cached_invoke(llm, "prompt") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["response 1"] * 5
+    assert llm.calls == 1
+    assert cache._INFLIGHT == {}
+
+
+def test_different_prompts_are_not_shared():
+    llm = FakeLLM()
+
+    async def run():
+        return await asyncio.gather(cached_invoke(llm, "a"), cached_invoke(llm, "b"))
+
+    assert sorted(asyncio.run(run())) == ["response 1", "response 2"]
+    assert llm.calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_request():
+    llm = FakeLLM()
+
+    async def run():
+        first = asyncio.ensure_future(cached_invoke(llm, "prompt"))
+        second = asyncio.ensure_future(cached_invoke(llm, "prompt"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "response 1"
+    assert llm.calls == 1
+
+
+def test_response_is_reused_until_its_ttl_expires(clock):
+    llm = FakeLLM()
+
+    assert asyncio.run(cached_invoke(llm, "prompt", ttl=60)) == "response 1"
+    clock.value += 59
+    assert asyncio.run(cached_invoke(llm, "prompt", ttl=60)) == "response 1"
+    clock.value += 2
+    assert asyncio.run(cached_invoke(llm, "prompt", ttl=60)) == "response 2"
+    assert llm.calls == 2
+
+
+def test_expired_entries_are_evicted(clock):
+    llm = FakeLLM()
+
+    asyncio.run(cached_invoke(llm, "prompt", ttl=1))
+    clock.value += 2
+
+    assert cache._lookup(next(iter(cache._RESPONSES))) is None
+    assert len(cache._RESPONSES) == 0
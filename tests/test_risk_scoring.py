@@ -0,0 +1,63 @@
+"""
+Tests for the lexicon-based risk severity used by deterministic risk scoring.
+"""
+
+import pytest
+
+from parallelization.nodes import risks
+from parallelization.nodes.risks import RISK_SATURATION, score_component
+
+# Appended so the length factor does not scale the severity down
+PADDING = " The remaining provisions follow market practice." * 10
+
+
+def test_unrelated_text_scores_zero():
+    assert score_component("The supplier has issued an invoice." + PADDING) == 0
+
+
+def test_phrase_severity_is_saturated():
+    assert score_component("Liability is uncapped." + PADDING) == pytest.approx(
+        1.0 / RISK_SATURATION
+    )
+    assert score_component(
+        "Liability is uncapped, with unlimited liability for penalties." + PADDING
+    ) == pytest.approx(1.0)
+
+
+def test_phrases_only_match_whole_words():
+    # "capacity" contains "cap" and "penalty box" is not a contractual penalty stem
+    assert score_component("The vendor has no capacity constraints." + PADDING) == 0
+    assert score_component("Payments are made as issued." + PADDING) == 0
+
+
+def test_stems_match_inflections():
+    for text in ("The buyer shall indemnify.", "Indemnification applies."):
+        assert score_component(text + PADDING) == pytest.approx(
+            risks.RISK_LEXICON[r"indemnif\w*"] / RISK_SATURATION
+        )
+
+
+def test_negated_phrases_do_not_count():
+    assert score_component("There is no uncapped liability." + PADDING) == 0
+    assert (
+        score_component("The agreement has no indemnification obligations." + PADDING)
+        == 0
+    )
+
+
+def test_negation_does_not_cross_clauses():
+    assert score_component("No, liability is uncapped." + PADDING) == pytest.approx(
+        1.0 / RISK_SATURATION
+    )
+
+
+def test_phrase_counts_when_any_occurrence_is_not_negated():
+    text = "There is no uncapped fee. Liability remains uncapped." + PADDING
+    assert score_component(text) == pytest.approx(1.0 / RISK_SATURATION)
+
+
+def test_short_analyses_are_scaled_down():
+    text = "Liability is uncapped."
+    assert score_component(text) == pytest.approx(
+        len(text) / risks.RISK_LENGTH_NORMALIZATION / RISK_SATURATION
+    )
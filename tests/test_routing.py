@@ -0,0 +1,53 @@
+"""
+Tests for the selection of analysis pipelines.
+"""
+
+import asyncio
+
+import pytest
+
+from parallelization.nodes import routing
+from parallelization.nodes.routing import ANALYSIS_PIPELINES, select_pipelines
+
+
+@pytest.fixture
+def router(monkeypatch):
+    """Replace the routing LLM call with one returning the given pipelines."""
+    calls = []
+
+    def configure(pipelines):
+        async def fake_call(state, template, output_class, **kwargs):
+            calls.append(state)
+            return {"pipelines": pipelines}
+
+        monkeypatch.setattr(routing, "call_structured_llm", fake_call)
+        return calls
+
+    return configure
+
+
+def test_contracts_run_every_pipeline_without_routing(router):
+    calls = router(["risks"])
+
+    result = asyncio.run(select_pipelines({"document_type": " Contract "}))
+
+    assert result == {"selected_pipelines": list(ANALYSIS_PIPELINES)}
+    assert calls == []
+
+
+def test_router_selection_is_deduplicated_in_order(router):
+    calls = router(["risks", "definitions", "risks"])
+    state = {"document_type": "NDA", "document_summary": "Mutual NDA."}
+
+    result = asyncio.run(select_pipelines(state))
+
+    assert result == {"selected_pipelines": ["risks", "definitions"]}
+    assert calls == [state]
+
+
+def test_empty_selection_falls_back_to_every_pipeline(router):
+    router([])
+
+    result = asyncio.run(select_pipelines({"document_type": "Letter of intent"}))
+
+    assert result == {"selected_pipelines": list(ANALYSIS_PIPELINES)}